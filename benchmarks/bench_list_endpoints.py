@@ -0,0 +1,111 @@
+"""Rows per second of the list endpoints, previous path vs the fast path.
+
+For vocabs the previous path queries ORM instances, validates them into the
+response schema and encodes the result the way FastAPI does. Scores were
+already served from the in-memory leaderboard, so there the previous path
+is the response_model validation and encoding of those entries. The fast
+path is get_vocab_json / get_all_scores_json.
+
+Usage (from the repository root):
+    python benchmarks/bench_list_endpoints.py --rows 10000 100000
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "server"))
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from database.database import Base
+from models.vocab import EnglishVocab
+from models.scores import ScoreSheet
+from schemas.vocab import Vocab
+from schemas.scores import Score
+from crud import vocab_crud, score_crud
+from services.leaderboard import leaderboard
+
+WORD_TYPES = ["noun", "verb", "adjective", "adverb"]
+
+
+def render(items, model) -> bytes:
+    return json.dumps(
+        jsonable_encoder([model.model_validate(i) for i in items]),
+        ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def seed(session, rows: int):
+    session.execute(insert(EnglishVocab), [
+        {
+            "word": f"word{i}",
+            "word_type": WORD_TYPES[i % len(WORD_TYPES)],
+            "meaning": f"meaning of word number {i}",
+            "example": f"An example sentence that uses word{i}.",
+        }
+        for i in range(rows)
+    ])
+    session.execute(insert(ScoreSheet), [
+        {"high_score": random.randint(0, 100000), "high_scorer": f"player{i % 5000}"} for i in range(rows)
+    ])
+    session.commit()
+
+
+def best_of(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def run(rows: int, repeat: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine)
+        with Session() as session:
+            seed(session, rows)
+
+        def fresh(fn):
+            def call():
+                with Session() as session:
+                    fn(session)
+            return call
+
+        leaderboard.clear()
+        with Session() as session:
+            leaderboard.load(session)
+
+        cases = [
+            ("vocab all", rows,
+             fresh(lambda s: render(vocab_crud.get_all_vocab(s), Vocab)),
+             fresh(lambda s: vocab_crud.get_vocab_json(s))),
+            ("vocab by type", rows // len(WORD_TYPES),
+             fresh(lambda s: render(vocab_crud.get_vocab_by_type(s, "noun"), Vocab)),
+             fresh(lambda s: vocab_crud.get_vocab_json(s, "noun"))),
+            ("scores all", rows,
+             fresh(lambda s: render(score_crud.get_all_scores(s), Score)),
+             fresh(lambda s: score_crud.get_all_scores_json(s))),
+        ]
+        for name, count, before, after in cases:
+            slow = best_of(before, repeat)
+            fast = best_of(after, repeat)
+            print(f"{rows:>8} {name:<14} before {count / slow:>12,.0f} rows/s   fast {count / fast:>12,.0f} rows/s   x{slow / fast:.1f}")
+        leaderboard.clear()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    for rows in args.rows:
+        run(rows, args.repeat)
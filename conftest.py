@@ -2,16 +2,47 @@ import sys
 import os
 import pytest
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 from fastapi.testclient import TestClient
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "server")))
 
-from database.database import Base
-from models import vocab, scores
+from database.database import Base, apply_sqlite_profile
+from models import vocab, scores, enrichment
 from main import app
+from services.leaderboard import leaderboard
+from services.word_type_index import word_type_index
+from services.word_prefix_index import word_prefix_index
+from services.vocab_version import vocab_version
+from services.vocab_snapshot import vocab_snapshot
+from services.enrichment import reset_failed_attempts
+from services.answer_cache import answer_cache
+from services.tts_cache import audio_cache
 
 SQLALCHEMY_TEST_DATABASE_URL = "sqlite:///./test_temp.db" 
+SQLALCHEMY_TEST_ASYNC_DATABASE_URL = "sqlite+aiosqlite:///./test_temp.db"
+
+@pytest.fixture(autouse=True)
+def reset_in_memory_state(tmp_path):
+    leaderboard.clear()
+    word_type_index.clear()
+    word_prefix_index.clear()
+    vocab_version.reset()
+    vocab_snapshot.clear()
+    reset_failed_attempts()
+    answer_cache.configure(db_url=f"sqlite:///{tmp_path / 'llm_cache.db'}")
+    audio_cache.configure(directory=str(tmp_path / "tts_cache"))
+    yield
+    leaderboard.clear()
+    word_type_index.clear()
+    word_prefix_index.clear()
+    vocab_version.reset()
+    vocab_snapshot.clear()
+    reset_failed_attempts()
+    answer_cache.configure()
+    audio_cache.configure()
 
 @pytest.fixture(scope="function")
 def test_db_engine():
@@ -31,18 +62,42 @@ def test_db_session(test_db_engine):
     session.close()
 
 @pytest.fixture(scope="function")
-def test_client(test_db_session):
-    from routers.vocab_router import get_db as vocab_get_db
-    from routers.score_router import get_db as score_get_db
+def test_async_sessionmaker(test_db_engine):
+    # Async sessions on the same database file the sync test_db_session writes
+    # to. NullPool keeps no connection alive between the event loops
+    # TestClient runs requests on.
+    async_engine = create_async_engine(SQLALCHEMY_TEST_ASYNC_DATABASE_URL, poolclass=NullPool)
+    return async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+@pytest.fixture(scope="function")
+def test_async_read_sessionmaker(test_db_engine):
+    read_engine = apply_sqlite_profile(create_async_engine(SQLALCHEMY_TEST_ASYNC_DATABASE_URL, poolclass=NullPool), read_only=True)
+    return async_sessionmaker(read_engine, autoflush=False, expire_on_commit=False)
+
+@pytest.fixture(scope="function")
+async def test_async_db_session(test_async_sessionmaker):
+    async with test_async_sessionmaker() as session:
+        yield session
+
+@pytest.fixture(scope="function")
+def test_client(test_db_session, test_async_sessionmaker, test_async_read_sessionmaker):
+    from routers.vocab_router import get_db as vocab_get_db, get_read_db as vocab_get_read_db
+    from routers.score_router import get_db as score_get_db, get_read_db as score_get_read_db
+
+    TestingAsyncSessionLocal = test_async_sessionmaker
+
+    async def override_get_db():
+        async with TestingAsyncSessionLocal() as db:
+            yield db
 
-    def override_get_db():
-        try:
-            yield test_db_session
-        finally:
-            pass
+    async def override_get_read_db():
+        async with test_async_read_sessionmaker() as db:
+            yield db
 
     app.dependency_overrides[vocab_get_db] = override_get_db
     app.dependency_overrides[score_get_db] = override_get_db
+    app.dependency_overrides[vocab_get_read_db] = override_get_read_db
+    app.dependency_overrides[score_get_read_db] = override_get_read_db
 
     yield TestClient(app)
 
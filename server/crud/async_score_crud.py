@@ -0,0 +1,53 @@
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from schemas.scores import ScoreCreate
+from crud import score_crud
+
+# Async counterparts of score_crud, see async_vocab_crud for the approach.
+
+async def get_all_scores(db: AsyncSession, offset: int = 0, limit: int = None):
+    return await db.run_sync(score_crud.get_all_scores, offset, limit)
+
+async def get_top_scores(db: AsyncSession, k: int):
+    return await db.run_sync(score_crud.get_top_scores, k)
+
+async def get_all_scores_json(db: AsyncSession, offset: int = 0, limit: int = None):
+    scores = await db.run_sync(score_crud.get_all_scores, offset, limit)
+    return await run_in_threadpool(score_crud.encode_scores, scores)
+
+async def get_top_scores_json(db: AsyncSession, k: int):
+    scores = await db.run_sync(score_crud.get_top_scores, k)
+    return await run_in_threadpool(score_crud.encode_scores, scores)
+
+async def count_ranked_scores(db: AsyncSession):
+    return await db.run_sync(score_crud.count_ranked_scores)
+
+async def count_scores(db: AsyncSession):
+    return await db.run_sync(score_crud.count_scores)
+
+async def get_score_stats(db: AsyncSession):
+    return await db.run_sync(score_crud.get_score_stats)
+
+async def get_high_score(db: AsyncSession):
+    return await db.run_sync(score_crud.get_high_score)
+
+async def get_scores_by_username(db: AsyncSession, username: str):
+    return await db.run_sync(score_crud.get_scores_by_username, username)
+
+async def get_best_score_by_username(db: AsyncSession, username: str):
+    return await db.run_sync(score_crud.get_best_score_by_username, username)
+
+async def get_best_scores_per_user(db: AsyncSession, limit: int = None):
+    return await db.run_sync(score_crud.get_best_scores_per_user, limit)
+
+async def get_score_rank(db: AsyncSession, score: int):
+    return await db.run_sync(score_crud.get_score_rank, score)
+
+async def get_user_rank(db: AsyncSession, username: str):
+    return await db.run_sync(score_crud.get_user_rank, username)
+
+async def create_score(db: AsyncSession, score: ScoreCreate):
+    return await db.run_sync(score_crud.create_score, score)
+
+async def delete_score_by_username(db: AsyncSession, username: str):
+    return await db.run_sync(score_crud.delete_score_by_username, username)
@@ -0,0 +1,80 @@
+from functools import partial
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.vocab import EnglishVocab
+from schemas.vocab import VocabCreate, VocabUpdate, VocabBulkUpdate
+from crud import vocab_crud
+from services.vocab_snapshot import vocab_snapshot
+
+# Async counterparts of vocab_crud. Each call runs the sync implementation on
+# the AsyncSession's connection through run_sync, so the queries and the
+# in-memory bookkeeping stay defined in one place. run_sync executes on the
+# event loop thread, so serialization of large results is handed to the
+# threadpool once the rows are fetched.
+
+async def get_vocab_by_word(db: AsyncSession, word: str):
+    return await db.run_sync(vocab_crud.get_vocab_by_word, word)
+
+async def get_vocab_json(db: AsyncSession, word_type: str = None, count: int = 0):
+    rows = await db.run_sync(vocab_crud.get_vocab_rows, word_type, count)
+    return await run_in_threadpool(vocab_crud.encode_vocab_rows, rows)
+
+async def get_vocab_snapshot(db: AsyncSession, word_type: str = None, compressed: bool = False):
+    version, body = await db.run_sync(vocab_crud.cached_vocab_snapshot, word_type, compressed)
+    if body is not None:
+        return body
+    rows = await db.run_sync(vocab_crud.get_vocab_rows, word_type)
+    return await run_in_threadpool(vocab_snapshot.get, version, word_type, partial(vocab_crud.encode_vocab_rows, rows), compressed)
+
+async def sample_vocab_by_type(db: AsyncSession, word_type: str, k: int):
+    return await db.run_sync(vocab_crud.sample_vocab_by_type, word_type, k)
+
+async def search_vocab(db: AsyncSession, q: str, limit: int = 20, offset: int = 0):
+    return await db.run_sync(vocab_crud.search_vocab, q, limit, offset)
+
+async def autocomplete_vocab(db: AsyncSession, prefix: str, limit: int = 10):
+    return await db.run_sync(vocab_crud.autocomplete_vocab, prefix, limit)
+
+async def get_vocab_page(db: AsyncSession, after_id: int = None, limit: int = 100, word_type: str = None):
+    return await db.run_sync(vocab_crud.get_vocab_page, after_id, limit, word_type)
+
+async def iter_vocab_batches(db: AsyncSession, word_type: str = None, batch_size: int = 500):
+    """Yield vocabs in batches from a streaming cursor instead of loading the whole table"""
+    result = await db.stream_scalars(vocab_crud.vocab_batches_stmt(word_type, batch_size))
+    async for batch in result.partitions():
+        yield batch
+        for vocab in batch:
+            db.expunge(vocab)
+
+async def get_vocab_by_count(db: AsyncSession, word_type: str):
+    return await db.run_sync(vocab_crud.get_vocab_by_count, word_type)
+
+async def count_vocab(db: AsyncSession):
+    return await db.run_sync(vocab_crud.count_vocab)
+
+async def get_vocab_stats(db: AsyncSession):
+    return await db.run_sync(vocab_crud.get_vocab_stats)
+
+async def get_all_word_types(db: AsyncSession):
+    return await db.run_sync(vocab_crud.get_all_word_types)
+
+async def get_word_type_catalog(db: AsyncSession):
+    return await db.run_sync(vocab_crud.get_word_type_catalog)
+
+async def create_vocab(db: AsyncSession, vocab: VocabCreate):
+    return await db.run_sync(vocab_crud.create_vocab, vocab)
+
+async def bulk_create_vocab(db: AsyncSession, vocabs: list[VocabCreate], chunk_size: int = 500):
+    return await db.run_sync(vocab_crud.bulk_create_vocab, vocabs, chunk_size)
+
+async def fill_missing_fields(db: AsyncSession, fills: list[dict]):
+    return await db.run_sync(vocab_crud.fill_missing_fields, fills)
+
+async def update_vocab(db: AsyncSession, db_vocab: EnglishVocab, vocab_update: VocabUpdate):
+    return await db.run_sync(vocab_crud.update_vocab, db_vocab, vocab_update)
+
+async def bulk_update_vocab(db: AsyncSession, updates: list[VocabBulkUpdate], chunk_size: int = 500):
+    return await db.run_sync(vocab_crud.bulk_update_vocab, updates, chunk_size)
+
+async def upsert_vocab(db: AsyncSession, vocabs: list[VocabCreate], chunk_size: int = 500):
+    return await db.run_sync(vocab_crud.upsert_vocab, vocabs, chunk_size)
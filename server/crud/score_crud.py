@@ -1,16 +1,77 @@
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 from models.scores import ScoreSheet
-from schemas.scores import ScoreCreate
-from sqlalchemy import desc, func
+from schemas.scores import Score, ScoreCreate, ScoreStats, ScoreRank
+from sqlalchemy import delete, func, select
+from services.leaderboard import leaderboard
 
+_score_list = TypeAdapter(list[Score])
 
-def get_all_scores(db: Session):
+def get_all_scores(db: Session, offset: int = 0, limit: int = None):
     """Get all scores ordered by score value descending"""
-    return db.query(ScoreSheet).order_by(desc(ScoreSheet.high_score)).all()
+    leaderboard.ensure_loaded(db)
+    return leaderboard.page(offset, limit)
+
+def get_top_scores(db: Session, k: int):
+    """Get the k highest scores"""
+    leaderboard.ensure_loaded(db)
+    return leaderboard.top(k)
+
+def encode_scores(scores: list[Score]) -> bytes:
+    """JSON list of leaderboard entries, no revalidation. Touches no session."""
+    return _score_list.dump_json(scores)
+
+def get_all_scores_json(db: Session, offset: int = 0, limit: int = None) -> bytes:
+    """get_all_scores serialized straight from the leaderboard entries"""
+    return encode_scores(get_all_scores(db, offset, limit))
+
+def get_top_scores_json(db: Session, k: int) -> bytes:
+    return encode_scores(get_top_scores(db, k))
+
+def count_ranked_scores(db: Session):
+    """Count entries on the in-memory leaderboard"""
+    leaderboard.ensure_loaded(db)
+    return len(leaderboard)
+
+def count_scores(db: Session):
+    """Count score entries without loading them"""
+    return db.query(func.count(ScoreSheet.id)).scalar()
+
+def get_score_stats(db: Session):
+    """Aggregate score totals in a single query"""
+    total, points, highest, lowest, players = db.query(
+        func.count(ScoreSheet.id),
+        func.coalesce(func.sum(ScoreSheet.high_score), 0),
+        func.max(ScoreSheet.high_score),
+        func.min(ScoreSheet.high_score),
+        func.count(func.distinct(func.lower(ScoreSheet.high_scorer)))
+    ).one()
+    return ScoreStats(
+        total_scores=total,
+        total_points=points,
+        highest_score=highest,
+        lowest_score=lowest,
+        total_players=players
+    )
 
 def get_high_score(db: Session):
     """Get the highest score entry"""
-    return db.query(ScoreSheet).order_by(desc(ScoreSheet.high_score)).first()
+    leaderboard.ensure_loaded(db)
+    return leaderboard.high_score()
+
+def get_score_rank(db: Session, score: int):
+    """Rank, board size and top percentile of a score, in O(log n) on the leaderboard"""
+    leaderboard.ensure_loaded(db)
+    rank, total = leaderboard.rank(score)
+    percentile = round(100 * min(rank, total) / total, 2) if total else 100.0
+    return ScoreRank(score=score, rank=rank, total=total, percentile=percentile)
+
+def get_user_rank(db: Session, username: str):
+    """Rank of the best score of a user, None if the user has no score"""
+    best = get_best_score_by_username(db, username)
+    if best is None:
+        return None
+    return get_score_rank(db, best.high_score)
 
 def create_score(db: Session, score: ScoreCreate):
     """Create a new score entry"""
@@ -21,16 +82,56 @@ def create_score(db: Session, score: ScoreCreate):
     db.add(db_score)
     db.commit()
     db.refresh(db_score)
+    leaderboard.add(Score.model_validate(db_score))
     return db_score
 
+def _scorer_matches(username: str):
+    """Case-insensitive username filter, served by ix_high_score_scorer_lower"""
+    return func.lower(ScoreSheet.high_scorer) == func.lower(username)
+
+def get_scores_by_username(db: Session, username: str):
+    """Get all scores of a user, best first"""
+    return (
+        db.query(ScoreSheet)
+        .filter(_scorer_matches(username))
+        .order_by(ScoreSheet.high_score.desc(), ScoreSheet.id)
+        .all()
+    )
+
+def get_best_score_by_username(db: Session, username: str):
+    """Get the best score of a user"""
+    return (
+        db.query(ScoreSheet)
+        .filter(_scorer_matches(username))
+        .order_by(ScoreSheet.high_score.desc(), ScoreSheet.id)
+        .first()
+    )
+
+def get_best_scores_per_user(db: Session, limit: int = None):
+    """Get the best score entry of every user, highest first"""
+    position = func.row_number().over(
+        partition_by=func.lower(ScoreSheet.high_scorer),
+        order_by=(ScoreSheet.high_score.desc(), ScoreSheet.id),
+    ).label("position")
+    ranked = select(ScoreSheet.id, position).subquery()
+    query = (
+        db.query(ScoreSheet)
+        .join(ranked, ranked.c.id == ScoreSheet.id)
+        .filter(ranked.c.position == 1)
+        .order_by(ScoreSheet.high_score.desc(), ScoreSheet.id)
+    )
+    if limit:
+        query = query.limit(limit)
+    return query.all()
+
 def delete_score_by_username(db: Session, username: str):
-    all_records = db.query(ScoreSheet).all()
-    
-    deleted_count = db.query(ScoreSheet).filter(
-        func.lower(ScoreSheet.high_scorer) == func.lower(username)
-    ).delete()
-    
-    print(f"DEBUG: Deleted count: {deleted_count}")
+    deleted_ids = db.execute(
+        delete(ScoreSheet)
+        .where(_scorer_matches(username))
+        .returning(ScoreSheet.id)
+    ).scalars().all()
+    deleted_count = len(deleted_ids)
     db.commit()
+    leaderboard.remove(deleted_ids)
     
     return deleted_count
\ No newline at end of file
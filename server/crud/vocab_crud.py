@@ -1,6 +1,32 @@
+import re
+import json
+import time
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import bindparam, column, func, insert, literal_column, select, table, update
 from sqlalchemy.orm import Session
-from models.vocab import EnglishVocab
-from schemas.vocab import VocabCreate, VocabUpdate, VocabCount, VocabTypes
+from models.vocab import EnglishVocab, VOCAB_FTS_TABLE
+from schemas.vocab import Vocab, VocabCreate, VocabUpdate, VocabBulkUpdate, VocabCount, VocabTypes, VocabTypeCatalog, VocabStats
+from services.word_type_index import word_type_index
+from services.word_prefix_index import word_prefix_index
+from services.vocab_version import vocab_version
+from services.vocab_snapshot import vocab_snapshot, compress
+
+_VOCAB_FIELDS = tuple(Vocab.model_fields)
+_VOCAB_COLUMNS = [EnglishVocab.__table__.c[name] for name in _VOCAB_FIELDS]
+
+def _after_vocab_write(added=(), retyped=()):
+    """Keep the in-memory vocab indexes in step with committed writes.
+
+    added holds (id, word, word_type) of inserted rows, retyped holds
+    (id, old_type, new_type) of rows whose word_type changed. Every call
+    bumps the dataset version used for ETags.
+    """
+    vocab_version.bump()
+    for vocab_id, word, word_type in added:
+        word_type_index.add(vocab_id, word_type)
+    word_prefix_index.add_many([word for _, word, _ in added])
+    word_type_index.move_many(retyped)
 
 def get_all_vocab(db: Session):
     return db.query(EnglishVocab).all()
@@ -14,25 +40,308 @@ def get_vocab_by_type(db: Session, word_type: str, count: int = 0):
         return query.limit(count).all()
     return query.all()
 
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+def get_vocab_rows(db: Session, word_type: str = None, count: int = 0) -> list:
+    """Core row tuples of vocabs, in Vocab field order"""
+    stmt = select(*_VOCAB_COLUMNS)
+    if word_type is not None:
+        stmt = stmt.where(EnglishVocab.word_type == word_type)
+    if count:
+        stmt = stmt.limit(count)
+    return db.connection().execute(stmt).all()
+
+def encode_vocab_rows(rows) -> bytes:
+    """JSON list of vocab rows.
+
+    Skips ORM hydration and pydantic validation but produces the same bytes
+    as a response_model=list[Vocab] response. Touches no session, so it can
+    run in the threadpool.
+    """
+    vocabs = [dict(zip(_VOCAB_FIELDS, row)) for row in rows]
+    return json.dumps(vocabs, ensure_ascii=False, allow_nan=False, separators=(",", ":"), default=_json_default).encode("utf-8")
+
+def get_vocab_json(db: Session, word_type: str = None, count: int = 0) -> bytes:
+    return encode_vocab_rows(get_vocab_rows(db, word_type, count))
+
+def cached_vocab_snapshot(db: Session, word_type: str = None, compressed: bool = False) -> tuple[str, Optional[bytes]]:
+    """Current dataset version and the snapshot bytes cached for it, None when they still have to be built"""
+    version = vocab_version.etag()
+    if word_type is not None:
+        word_type_index.ensure_loaded(db)
+        if not word_type_index.count(word_type):
+            # Unknown types are not cached, so arbitrary URLs cannot grow the snapshot.
+            return version, compress(b"[]") if compressed else b"[]"
+    return version, vocab_snapshot.cached(version, word_type, compressed)
+
+def get_vocab_snapshot(db: Session, word_type: str = None, compressed: bool = False) -> bytes:
+    """JSON body of the full vocab list (or one word_type slice), serialized once per dataset version"""
+    version, body = cached_vocab_snapshot(db, word_type, compressed)
+    if body is not None:
+        return body
+    return vocab_snapshot.get(version, word_type, lambda: get_vocab_json(db, word_type), compressed)
+
+def get_vocab_by_ids(db: Session, ids: list[int]):
+    """Fetch vocabs with one IN query, returned in the order of ids"""
+    if not ids:
+        return []
+    by_id = {v.id: v for v in db.query(EnglishVocab).filter(EnglishVocab.id.in_(ids)).all()}
+    return [by_id[i] for i in ids if i in by_id]
+
+def sample_vocab_by_type(db: Session, word_type: str, k: int):
+    """k random vocabs of one type, sampled from the in-memory id index"""
+    word_type_index.ensure_loaded(db)
+    return get_vocab_by_ids(db, word_type_index.sample(word_type, k))
+
+_SEARCH_TERM = re.compile(r"\w+\*?")
+
+def build_match_query(q: str) -> Optional[str]:
+    """Turn free text into an FTS5 query of quoted terms, a trailing * keeps prefix matching"""
+    terms = []
+    for term in _SEARCH_TERM.findall(q):
+        terms.append(f'"{term[:-1]}"*' if term.endswith("*") else f'"{term}"')
+    return " ".join(terms) or None
+
+def search_vocab(db: Session, q: str, limit: int = 20, offset: int = 0):
+    """BM25 ranked full-text search over word, meaning and example"""
+    match_query = build_match_query(q)
+    if match_query is None:
+        return {"total": 0, "results": []}
+    fts = table(VOCAB_FTS_TABLE, column("rowid"))
+    fts_ref = literal_column(VOCAB_FTS_TABLE)
+    match = fts_ref.op("MATCH")(match_query)
+    rank = func.bm25(fts_ref, 10.0, 2.0, 1.0).label("rank")
+    snippet = func.snippet(fts_ref, -1, "<mark>", "</mark>", "...", 12).label("snippet")
+    total = db.execute(select(func.count()).select_from(fts).where(match)).scalar_one()
+    stmt = (
+        select(*EnglishVocab.__table__.c, rank, snippet)
+        .select_from(fts)
+        .join(EnglishVocab, EnglishVocab.id == fts.c.rowid)
+        .where(match)
+        .order_by(rank)
+        .limit(limit)
+        .offset(offset)
+    )
+    return {"total": total, "results": db.execute(stmt).all()}
+
+def autocomplete_vocab(db: Session, prefix: str, limit: int = 10):
+    """Words starting with prefix (case-insensitive), served from the in-memory prefix index"""
+    word_prefix_index.ensure_loaded(db)
+    return word_prefix_index.complete(prefix, limit)
+
+def get_vocab_page(db: Session, after_id: int = None, limit: int = 100, word_type: str = None):
+    """Keyset page of vocabs ordered by id, starting after the given cursor"""
+    query = db.query(EnglishVocab)
+    if word_type is not None:
+        query = query.filter(EnglishVocab.word_type == word_type)
+    if after_id is not None:
+        query = query.filter(EnglishVocab.id > after_id)
+    return query.order_by(EnglishVocab.id).limit(limit).all()
+
+def vocab_batches_stmt(word_type: str = None, batch_size: int = 500):
+    stmt = select(EnglishVocab).order_by(EnglishVocab.id)
+    if word_type is not None:
+        stmt = stmt.where(EnglishVocab.word_type == word_type)
+    return stmt.execution_options(yield_per=batch_size)
+
 def get_vocab_by_count(db: Session, word_type: str):
-    count = db.query(EnglishVocab).filter(EnglishVocab.word_type == word_type).count()
-    return VocabCount(word_type=word_type, count=count)
+    word_type_index.ensure_loaded(db)
+    return VocabCount(word_type=word_type, count=word_type_index.count(word_type))
+
+def count_vocab(db: Session):
+    return db.query(func.count(EnglishVocab.id)).scalar()
+
+def get_word_type_counts(db: Session):
+    """Live count per word_type from the in-memory catalog"""
+    word_type_index.ensure_loaded(db)
+    return word_type_index.counts()
+
+def get_vocab_stats(db: Session):
+    return VocabStats(total_words=count_vocab(db), word_types=get_word_type_counts(db))
 
 def get_all_word_types(db: Session):
-    types = (db.query(EnglishVocab.word_type).distinct().all())
-    type_list = [t[0] for t in types]
-    return VocabTypes(word_types=type_list)
+    return VocabTypes(word_types=list(get_word_type_counts(db)))
+
+def get_word_type_catalog(db: Session):
+    return VocabTypeCatalog(word_types=[VocabCount(word_type=t, count=c) for t, c in get_word_type_counts(db).items()])
 
 def create_vocab(db: Session, vocab: VocabCreate):
     db_vocab = EnglishVocab(**vocab.dict())
     db.add(db_vocab)
     db.commit()
     db.refresh(db_vocab)
+    _after_vocab_write(added=[(db_vocab.id, db_vocab.word, db_vocab.word_type)])
     return db_vocab
 
+def get_existing_words(db: Session, words: list[str], chunk_size: int = 500):
+    """Return the subset of words already stored, checked in chunked IN queries"""
+    existing = set()
+    for start in range(0, len(words), chunk_size):
+        chunk = words[start:start + chunk_size]
+        rows = db.query(EnglishVocab.word).filter(EnglishVocab.word.in_(chunk)).all()
+        existing.update(r[0] for r in rows)
+    return existing
+
+def bulk_create_vocab(db: Session, vocabs: list[VocabCreate], chunk_size: int = 500):
+    """Insert many vocabs in a single transaction, skipping words that already exist"""
+    started = time.perf_counter()
+    unique = {}
+    existing_words = set()
+    for vocab in vocabs:
+        if not vocab:
+            continue
+        if vocab.word in unique:
+            existing_words.add(vocab.word)
+        else:
+            unique[vocab.word] = vocab
+    already_stored = get_existing_words(db, list(unique), chunk_size)
+    existing_words.update(already_stored)
+    rows = [v.model_dump() for w, v in unique.items() if w not in already_stored]
+    stmt = insert(EnglishVocab).returning(EnglishVocab.id, EnglishVocab.word, EnglishVocab.word_type)
+    added = []
+    try:
+        for start in range(0, len(rows), chunk_size):
+            added.extend(db.execute(stmt, rows[start:start + chunk_size]).all())
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    _after_vocab_write(added=added)
+    elapsed = time.perf_counter() - started
+    return {
+        "words_inserted": len(rows),
+        "existing_words": existing_words,
+        "elapsed_ms": round(elapsed * 1000, 2),
+        "words_per_second": round(len(rows) / elapsed, 2) if elapsed > 0 else None,
+    }
+
+def fill_missing_fields(db: Session, fills: list[dict]):
+    """Set meaning/example only where they are still NULL, one executemany statement.
+
+    Each fill is {"id": ..., "meaning": ..., "example": ...}.
+    """
+    if not fills:
+        return 0
+    params = [{"vocab_id": f["id"], "fill_meaning": f.get("meaning"), "fill_example": f.get("example")} for f in fills]
+    vocabs = EnglishVocab.__table__
+    stmt = (
+        update(vocabs)
+        .where(vocabs.c.id == bindparam("vocab_id"))
+        .values(
+            meaning=func.coalesce(vocabs.c.meaning, bindparam("fill_meaning")),
+            example=func.coalesce(vocabs.c.example, bindparam("fill_example")),
+        )
+    )
+    db.execute(stmt, params)
+    db.commit()
+    _after_vocab_write()
+    return len(fills)
+
 def update_vocab(db: Session, db_vocab: EnglishVocab, vocab_update: VocabUpdate):
+    old_type = db_vocab.word_type
     for key, value in vocab_update.dict(exclude_unset=True).items():
         setattr(db_vocab, key, value)
     db.commit()
     db.refresh(db_vocab)
-    return db_vocab
\ No newline at end of file
+    _after_vocab_write(retyped=[(db_vocab.id, old_type, db_vocab.word_type)])
+    return db_vocab
+
+def _resolve_words(db: Session, words: list[str], chunk_size: int = 500):
+    """Map stored words to (id, word_type), looked up in chunked IN queries"""
+    found = {}
+    for start in range(0, len(words), chunk_size):
+        chunk = words[start:start + chunk_size]
+        rows = db.execute(select(EnglishVocab.word, EnglishVocab.id, EnglishVocab.word_type).where(EnglishVocab.word.in_(chunk)))
+        found.update((word, (vocab_id, word_type)) for word, vocab_id, word_type in rows)
+    return found
+
+def _write_vocab_changes(db: Session, inserts: list[dict], updates: list[dict], stored: dict, chunk_size: int):
+    """Insert and update by primary key in one transaction, then refresh the in-memory indexes"""
+    stmt = insert(EnglishVocab).returning(EnglishVocab.id, EnglishVocab.word, EnglishVocab.word_type)
+    added = []
+    now = datetime.utcnow()
+    rows = [{**changes, "id": stored[word][0], "updated_at": now} for word, changes in updates]
+    try:
+        for start in range(0, len(inserts), chunk_size):
+            added.extend(db.execute(stmt, inserts[start:start + chunk_size]).all())
+        for start in range(0, len(rows), chunk_size):
+            db.execute(update(EnglishVocab), rows[start:start + chunk_size])
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    retyped = [
+        (stored[word][0], stored[word][1], changes["word_type"])
+        for word, changes in updates if "word_type" in changes
+    ]
+    _after_vocab_write(added=added, retyped=retyped)
+
+def bulk_update_vocab(db: Session, updates: list[VocabBulkUpdate], chunk_size: int = 500):
+    """Apply many partial updates in a single transaction with executemany UPDATEs by id.
+
+    Only the fields set on each item are written. Returns one outcome per
+    received item: updated, unchanged (no fields besides word), not_found or
+    duplicate (word repeated in the payload).
+    """
+    started = time.perf_counter()
+    results = []
+    changes = {}
+    for item in updates:
+        if item.word in changes:
+            results.append({"word": item.word, "status": "duplicate"})
+            continue
+        changes[item.word] = item.model_dump(exclude_unset=True, exclude={"word"})
+        results.append({"word": item.word, "status": None})
+    stored = _resolve_words(db, list(changes), chunk_size)
+    pending = [(word, fields) for word, fields in changes.items() if word in stored and fields]
+    _write_vocab_changes(db, [], pending, stored, chunk_size)
+    for result in results:
+        if result["status"] is None:
+            word = result["word"]
+            result["status"] = "not_found" if word not in stored else "updated" if changes[word] else "unchanged"
+    return {
+        "words_updated": len(pending),
+        "results": results,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
+
+def upsert_vocab(db: Session, vocabs: list[VocabCreate], chunk_size: int = 500):
+    """Insert new words and update the set fields of stored ones, in a single transaction.
+
+    Returns one outcome per received item: inserted, updated, unchanged (a
+    stored word sent without other fields) or duplicate.
+    """
+    started = time.perf_counter()
+    results = []
+    unique = {}
+    for vocab in vocabs:
+        if vocab.word in unique:
+            results.append({"word": vocab.word, "status": "duplicate"})
+            continue
+        unique[vocab.word] = vocab
+        results.append({"word": vocab.word, "status": None})
+    stored = _resolve_words(db, list(unique), chunk_size)
+    inserts = []
+    pending = []
+    for word, vocab in unique.items():
+        if word not in stored:
+            inserts.append(vocab.model_dump())
+            continue
+        fields = vocab.model_dump(exclude_unset=True, exclude={"word"})
+        if fields:
+            pending.append((word, fields))
+    _write_vocab_changes(db, inserts, pending, stored, chunk_size)
+    changed = {word for word, _ in pending}
+    for result in results:
+        if result["status"] is None:
+            word = result["word"]
+            result["status"] = "inserted" if word not in stored else "updated" if word in changed else "unchanged"
+    return {
+        "words_inserted": len(inserts),
+        "words_updated": len(pending),
+        "results": results,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
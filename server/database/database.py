@@ -1,13 +1,74 @@
-from sqlalchemy import create_engine
+import os
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./database/english_vocab.db"
+SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./database/english_vocab.db")
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-)
+def to_async_url(url: str) -> str:
+    """sqlite:///x.db -> sqlite+aiosqlite:///x.db, other URLs must name a driver with sync and async support"""
+    parsed = make_url(url)
+    if parsed.drivername == "sqlite":
+        return parsed.set(drivername="sqlite+aiosqlite").render_as_string(hide_password=False)
+    return url
+
+# Always derived from DATABASE_URL: startup DDL and index seeding use the sync
+# engine, so both engines have to point at the same database.
+SQLALCHEMY_ASYNC_DATABASE_URL = to_async_url(SQLALCHEMY_DATABASE_URL)
+
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_CACHE_SIZE = int(os.getenv("SQLITE_CACHE_SIZE", "-65536"))  # negative means KiB, so 64 MiB
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+DB_READ_POOL_SIZE = int(os.getenv("DB_READ_POOL_SIZE", "8"))
+DB_WRITE_POOL_TIMEOUT = float(os.getenv("DB_WRITE_POOL_TIMEOUT", "30"))
+
+def apply_sqlite_profile(engine, read_only: bool = False):
+    """Set the connection pragmas on every new SQLite connection of the engine"""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    if sync_engine.dialect.name != "sqlite":
+        return engine
+
+    @event.listens_for(sync_engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+        if not read_only:
+            cursor.execute(f"PRAGMA journal_mode={SQLITE_JOURNAL_MODE}")
+        cursor.execute(f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+        cursor.execute(f"PRAGMA cache_size={SQLITE_CACHE_SIZE}")
+        if read_only:
+            cursor.execute("PRAGMA query_only=ON")
+        cursor.close()
+
+    return engine
+
+# check_same_thread is a sqlite3 option, other DBAPIs reject it
+_connect_args = {"check_same_thread": False} if make_url(SQLALCHEMY_DATABASE_URL).get_backend_name() == "sqlite" else {}
+
+engine = apply_sqlite_profile(create_engine(
+    SQLALCHEMY_DATABASE_URL, connect_args=_connect_args
+))
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-Base = declarative_base()
\ No newline at end of file
+# Mutations go through a single pooled writer connection so they queue in the
+# pool instead of fighting over the SQLite write lock. GET routes use a
+# separate pool of read-only connections, in WAL mode they never wait for it.
+async_engine = apply_sqlite_profile(create_async_engine(
+    SQLALCHEMY_ASYNC_DATABASE_URL, pool_size=1, max_overflow=0, pool_timeout=DB_WRITE_POOL_TIMEOUT
+))
+async_read_engine = apply_sqlite_profile(create_async_engine(
+    SQLALCHEMY_ASYNC_DATABASE_URL, pool_size=DB_READ_POOL_SIZE, max_overflow=0
+), read_only=True)
+
+# Objects returned from the routers are serialized after the session closes,
+# so they must not be expired by the commit
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+AsyncReadSessionLocal = async_sessionmaker(async_read_engine, autoflush=False, expire_on_commit=False)
+
+Base = declarative_base()
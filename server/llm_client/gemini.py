@@ -1,19 +1,42 @@
 import os
+import asyncio
 from dotenv import load_dotenv
 from google import genai
 from google.genai import types
 from google.api_core import exceptions
 from schemas.llm_client import ClientResponse
+from llm_client.http_pool import get_http_client
 
 load_dotenv()
 
+GEMINI_MODEL = "gemini-2.5-flash-lite"
+GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "32"))
+
 client = genai.Client(api_key=os.getenv("GEMINI_API_KEY"))
 
+_async_client = None
+_async_http = None
+
+_slots = asyncio.Semaphore(GEMINI_MAX_CONCURRENCY)
+
+
+def get_async_client():
+    """Gemini aio client bound to the shared http pool, rebuilt if the pool was recreated"""
+    global _async_client, _async_http
+    http_client = get_http_client()
+    if _async_client is None or _async_http is not http_client:
+        _async_client = genai.Client(
+            api_key=os.getenv("GEMINI_API_KEY"),
+            http_options=types.HttpOptions(httpx_async_client=http_client),
+        ).aio
+        _async_http = http_client
+    return _async_client
+
 
 def ask_gemini(prompt: str, instruction: str) -> dict:
     try:
         response = client.models.generate_content(
-            model="gemini-2.5-flash-lite",
+            model=GEMINI_MODEL,
             config=types.GenerateContentConfig(system_instruction=instruction),
             contents=prompt
         )
@@ -23,3 +46,31 @@ def ask_gemini(prompt: str, instruction: str) -> dict:
         return ClientResponse(status_code=e.code, details=e.message)
     except Exception as e:
         return ClientResponse(status_code=500, details=f"[Gemini Error] {str(e)}")
+
+
+async def ask_gemini_async(prompt: str, instruction: str) -> dict:
+    try:
+        async with _slots:
+            response = await get_async_client().models.generate_content(
+                model=GEMINI_MODEL,
+                config=types.GenerateContentConfig(system_instruction=instruction),
+                contents=prompt
+            )
+        return ClientResponse(status_code=200, details=response.text)
+    except exceptions.GoogleAPICallError as e:
+        return ClientResponse(status_code=e.code, details=e.message)
+    except Exception as e:
+        return ClientResponse(status_code=500, details=f"[Gemini Error] {str(e)}")
+
+
+async def stream_gemini(prompt: str, instruction: str):
+    """Yield answer text as the provider produces it"""
+    async with _slots:
+        chunks = await get_async_client().models.generate_content_stream(
+            model=GEMINI_MODEL,
+            config=types.GenerateContentConfig(system_instruction=instruction),
+            contents=prompt
+        )
+        async for chunk in chunks:
+            if chunk.text:
+                yield chunk.text
@@ -1,25 +1,70 @@
 import os
+import asyncio
 from dotenv import load_dotenv
-from sarvamai import SarvamAI
+from sarvamai import SarvamAI, AsyncSarvamAI
 from schemas.llm_client import ClientResponse
+from llm_client.http_pool import get_http_client
 
 load_dotenv()
 
+SARVAM_MAX_CONCURRENCY = int(os.getenv("SARVAM_MAX_CONCURRENCY", "32"))
+
 client = SarvamAI(
     api_subscription_key=os.getenv("SARVAM_API_KEY"),
 )
 
+_async_client = None
+_async_http = None
+
+_slots = asyncio.Semaphore(SARVAM_MAX_CONCURRENCY)
+
+
+def get_async_client() -> AsyncSarvamAI:
+    """AsyncSarvamAI bound to the shared http pool, rebuilt if the pool was recreated"""
+    global _async_client, _async_http
+    http_client = get_http_client()
+    if _async_client is None or _async_http is not http_client:
+        _async_client = AsyncSarvamAI(
+            api_subscription_key=os.getenv("SARVAM_API_KEY"),
+            httpx_client=http_client,
+        )
+        _async_http = http_client
+    return _async_client
+
+
+def _messages(prompt: str, instruction: str):
+    return [
+        {
+            "role": "user",
+            "content": "\n".join([instruction, prompt])
+        }
+    ]
+
 
 def ask_sarvam(prompt: str, instruction: str):
     try:
         # print("\n".join([instruction, prompt]))
-        response = client.chat.completions(messages=[
-            {
-                "role": "user",
-                "content": "\n".join([instruction, prompt])
-            }
-        ])
+        response = client.chat.completions(messages=_messages(prompt, instruction))
+        res = response.choices[0].message.content
+        return ClientResponse(status_code=200, details=res)
+    except Exception as e:
+        return ClientResponse(status_code=500, details=f"[Sarvam Error] {str(e)}")
+
+
+async def ask_sarvam_async(prompt: str, instruction: str):
+    try:
+        async with _slots:
+            response = await get_async_client().chat.completions(messages=_messages(prompt, instruction))
         res = response.choices[0].message.content
         return ClientResponse(status_code=200, details=res)
     except Exception as e:
         return ClientResponse(status_code=500, details=f"[Sarvam Error] {str(e)}")
+
+
+async def stream_sarvam(prompt: str, instruction: str):
+    """Yield answer text as the provider produces it"""
+    async with _slots:
+        chunks = await get_async_client().chat.completions(messages=_messages(prompt, instruction), stream=True)
+        async for chunk in chunks:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
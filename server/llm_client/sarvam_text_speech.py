@@ -4,26 +4,43 @@ import traceback
 from dotenv import load_dotenv
 from schemas.llm_client import TextToSpeechLLMRes
 from fastapi import HTTPException
+from llm_client.http_pool import get_http_client
 
 load_dotenv()
 
+def _error_detail(res: httpx.Response):
+    try:
+        return res.json()
+    except ValueError:
+        return res.text or "Text to Speech Conversion failed"
+
 async def sarvamTextToSpeech(req):
+    res = None
     try:
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            res = await client.post(
-                os.getenv("SARVAM_TEXT_TO_SPEECH_API_URI"),
-                json=req.model_dump(),
-                headers={
-                    "api-subscription-key": os.getenv("SARVAM_API_KEY")
-                }
-            )
+        res = await get_http_client().post(
+            os.getenv("SARVAM_TEXT_TO_SPEECH_API_URI"),
+            json=req.model_dump(),
+            headers={
+                "api-subscription-key": os.getenv("SARVAM_API_KEY")
+            }
+        )
         status = res.status_code
         if 200 <= status < 300:
-            res = res.json()
-            return TextToSpeechLLMRes(req_id=res.get('request_id'), audio=res.get('audios'))
-        raise HTTPException(status_code=status, detail="Text to Speech Conversion failed" if not res else res.json())
+            try:
+                body = res.json()
+                return TextToSpeechLLMRes(req_id=body.get('request_id'), audio=body.get('audios'))
+            except (ValueError, AttributeError) as e:
+                # A success status with an unusable body is the provider's fault, not a 2xx for our client.
+                raise HTTPException(status_code=502, detail=f"Invalid Text to Speech response: {e}")
+        raise HTTPException(status_code=status, detail=_error_detail(res))
+    except HTTPException:
+        raise
     except httpx.ConnectTimeout:
         raise HTTPException(status_code=504, detail="Connection Timeout")
+    except httpx.TimeoutException:
+        raise HTTPException(status_code=504, detail="Text to Speech provider timed out")
     except Exception as e:
         traceback.print_exc()
-        raise HTTPException(status_code=status if status else 500, detail=str(e) if not res else res.json())
+        if res is None:
+            raise HTTPException(status_code=500, detail=str(e))
+        raise HTTPException(status_code=res.status_code if res.status_code >= 400 else 502, detail=_error_detail(res))
@@ -2,11 +2,21 @@ import os
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy.schema import CreateIndex
 from routers.vocab_router import router as vocab_api_router
 from routers.score_router import router as score_api_router
 from routers.llm_router import router as llm_api_router
 from routers.text_to_speech import router as text_to_speech_router
-from database.database import engine, Base
+from database.database import engine, Base, SessionLocal
+from services.leaderboard import leaderboard
+from services.word_type_index import word_type_index
+from services.word_prefix_index import word_prefix_index
+from services.answer_cache import answer_cache
+from llm_client.http_pool import start_http_client, close_http_client
+from services.enrichment import start_enrichment_worker, stop_enrichment_worker
+from models import vocab, scores, enrichment
+from models.vocab import create_vocab_fts
+from models.scores import ix_high_score_scorer_lower
 
 app = FastAPI(title="English Vocabulary API")
 
@@ -21,6 +31,25 @@ app.add_middleware(
 @app.on_event("startup")
 def on_startup():
     Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        # Expression indexes are not reflected, so checkfirst cannot see them.
+        conn.execute(CreateIndex(ix_high_score_scorer_lower, if_not_exists=True))
+        create_vocab_fts(conn)
+    with SessionLocal() as db:
+        leaderboard.load(db)
+        word_type_index.load(db)
+        word_prefix_index.load(db)
+    answer_cache.purge_expired()
+
+@app.on_event("startup")
+async def open_http_pool():
+    await start_http_client()
+    start_enrichment_worker()
+
+@app.on_event("shutdown")
+async def close_http_pool():
+    await stop_enrichment_worker()
+    await close_http_client()
 
 @app.get("/")
 async def root():
@@ -0,0 +1,10 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from datetime import datetime
+from database.database import Base
+
+class EnrichmentCheckpoint(Base):
+    __tablename__ = "enrichment_checkpoints"
+
+    name = Column(String, primary_key=True)
+    last_id = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
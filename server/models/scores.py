@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, DateTime, Index, func
 from datetime import datetime
 from database.database import Base
 
@@ -8,4 +8,12 @@ class ScoreSheet(Base):
     id = Column(Integer, primary_key=True, index=True)
     high_score = Column(Integer, unique=False)
     high_scorer = Column(String, unique=False)
-    date_created = Column(DateTime, default=datetime.utcnow)
\ No newline at end of file
+    date_created = Column(DateTime, default=datetime.utcnow)
+
+# Username lookups compare lower(high_scorer), this expression index lets
+# SQLite resolve them (and the best score of a user) without a table scan.
+ix_high_score_scorer_lower = Index(
+    "ix_high_score_scorer_lower",
+    func.lower(ScoreSheet.high_scorer),
+    ScoreSheet.high_score.desc(),
+)
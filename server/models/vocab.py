@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, DateTime, event, text
 from datetime import datetime
 from database.database import Base
 
@@ -11,4 +11,51 @@ class EnglishVocab(Base):
     meaning = Column(String, nullable=True)
     example = Column(String, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
\ No newline at end of file
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+VOCAB_FTS_TABLE = "english_vocabs_fts"
+
+VOCAB_FTS_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {VOCAB_FTS_TABLE} USING fts5(
+        word, meaning, example,
+        content='english_vocabs', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {VOCAB_FTS_TABLE}_ai AFTER INSERT ON english_vocabs BEGIN
+        INSERT INTO {VOCAB_FTS_TABLE}(rowid, word, meaning, example) VALUES (new.id, new.word, new.meaning, new.example);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {VOCAB_FTS_TABLE}_ad AFTER DELETE ON english_vocabs BEGIN
+        INSERT INTO {VOCAB_FTS_TABLE}({VOCAB_FTS_TABLE}, rowid, word, meaning, example) VALUES ('delete', old.id, old.word, old.meaning, old.example);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {VOCAB_FTS_TABLE}_au AFTER UPDATE ON english_vocabs BEGIN
+        INSERT INTO {VOCAB_FTS_TABLE}({VOCAB_FTS_TABLE}, rowid, word, meaning, example) VALUES ('delete', old.id, old.word, old.meaning, old.example);
+        INSERT INTO {VOCAB_FTS_TABLE}(rowid, word, meaning, example) VALUES (new.id, new.word, new.meaning, new.example);
+    END""",
+]
+
+
+def create_vocab_fts(connection):
+    """Create the FTS5 mirror of english_vocabs and its sync triggers.
+
+    The index is rebuilt from english_vocabs when the virtual table is new,
+    so databases created before search existed get indexed on startup.
+    """
+    if connection.dialect.name != "sqlite":
+        return
+    exists = connection.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": VOCAB_FTS_TABLE}
+    ).first()
+    for ddl in VOCAB_FTS_DDL:
+        connection.execute(text(ddl))
+    if exists is None:
+        connection.execute(text(f"INSERT INTO {VOCAB_FTS_TABLE}({VOCAB_FTS_TABLE}) VALUES ('rebuild')"))
+
+
+@event.listens_for(EnglishVocab.__table__, "after_create")
+def _after_vocab_table_create(target, connection, **kw):
+    create_vocab_fts(connection)
+
+
+@event.listens_for(EnglishVocab.__table__, "before_drop")
+def _before_vocab_table_drop(target, connection, **kw):
+    if connection.dialect.name == "sqlite":
+        connection.execute(text(f"DROP TABLE IF EXISTS {VOCAB_FTS_TABLE}"))
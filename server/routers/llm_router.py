@@ -1,32 +1,149 @@
-from fastapi import APIRouter, HTTPException
-from schemas.llm_client import SendPrompt, GetAnswers
-from llm_client.gemini import ask_gemini
-from llm_client.sarvam_ai import ask_sarvam
+import os
+import json
+import asyncio
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from schemas.llm_client import SendPrompt, GetAnswers, BatchAnswer
+from llm_client.gemini import ask_gemini_async, stream_gemini
+from llm_client.sarvam_ai import ask_sarvam_async, stream_sarvam
+from services.answer_cache import answer_cache, cache_key
+from services.singleflight import inflight
 
 router = APIRouter(prefix="/ai", tags=["artifial_intelligence"])
 
+AI_BATCH_MAX_ITEMS = int(os.getenv("AI_BATCH_MAX_ITEMS", "500"))
+AI_BATCH_CONCURRENCY = int(os.getenv("AI_BATCH_CONCURRENCY", "8"))
+AI_BATCH_ITEM_TIMEOUT = float(os.getenv("AI_BATCH_ITEM_TIMEOUT", "30"))
+
+DEFAULT_INSTRUCTION = "You are a english professor. No need to explain the word. Only answer what's asked, Nothing extra."
+
+def build_prompt(user_query: SendPrompt):
+    """Assemble the (context, instruction) pair sent to the provider"""
+    original_context = [user_query.prompt]
+    user_instructions = user_query.instruction
+    if user_query.word:
+        original_context.append(user_query.word)
+    if user_query.word_type:
+        original_context.append(user_query.word_type)
+    if user_query.meaning:
+        original_context.append(user_query.meaning)
+    if user_query.example:
+        original_context.append(user_query.example)
+    if not user_instructions:
+        user_instructions = DEFAULT_INSTRUCTION
+    context = "\n".join(original_context).strip()
+    return context, user_instructions
+
+async def fetch_answer(context: str, user_instructions: str):
+    """One provider call, shared by every identical request in flight"""
+    # response = await ask_gemini_async(prompt=context, instruction=user_instructions)
+    response = await ask_sarvam_async(prompt=context, instruction=user_instructions)
+    if response and response.status_code == 200 and response.details:
+        await run_in_threadpool(answer_cache.set, context, user_instructions, response.details)
+    return response
+
+async def resolve_answer(user_query: SendPrompt, bypass_cache: bool = False):
+    context, user_instructions = build_prompt(user_query)
+    if not bypass_cache:
+        cached = answer_cache.get_from_memory(context, user_instructions)
+        if cached is None:
+            cached = await run_in_threadpool(answer_cache.get, context, user_instructions)
+        if cached is not None:
+            return GetAnswers(received_prompt=context, answer=cached)
+    response = await inflight.do(f"answer:{cache_key(context, user_instructions)}", lambda: fetch_answer(context, user_instructions))
+    if response and response.status_code != 200:
+        raise HTTPException(status_code=response.status_code, detail=response.details)
+    return GetAnswers(received_prompt=context, answer = response.details)
+
 @router.post("/get_answers", response_model=GetAnswers)
-def get_ai_answer(user_query: SendPrompt):
+async def get_ai_answer(user_query: SendPrompt, bypass_cache: bool = False):
     try:
-        original_context = [user_query.prompt]
-        user_instructions = user_query.instruction
-        if user_query.word:
-            original_context.append(user_query.word)
-        if user_query.word_type:
-            original_context.append(user_query.word_type)
-        if user_query.meaning:
-            original_context.append(user_query.meaning)
-        if user_query.example:
-            original_context.append(user_query.example)
-        if not user_instructions:
-            user_instructions = "You are a english professor. No need to explain the word. Only answer what's asked, Nothing extra."
-        
-        context = "\n".join(original_context)
-        context.strip()
-        # response = ask_gemini(prompt=context, instruction=user_instructions)
-        response = ask_sarvam(prompt=context, instruction=user_instructions)
-        if response and response.status_code != 200:
-            raise HTTPException(status_code=response.status_code, detail=response.details)
-        return GetAnswers(received_prompt=context, answer = response.details)
+        return await resolve_answer(user_query, bypass_cache)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Unknown Error occured: {str(e)}")
+
+async def answer_batch_item(index: int, user_query: SendPrompt, bypass_cache: bool, slots: asyncio.Semaphore, item_timeout: float):
+    async with slots:
+        try:
+            answer = await asyncio.wait_for(resolve_answer(user_query, bypass_cache), timeout=item_timeout)
+            return BatchAnswer(index=index, status_code=200, received_prompt=answer.received_prompt, answer=answer.answer)
+        except asyncio.TimeoutError:
+            return BatchAnswer(index=index, status_code=504, error=f"Timed out after {item_timeout}s")
+        except HTTPException as e:
+            return BatchAnswer(index=index, status_code=e.status_code, error=str(e.detail))
+        except Exception as e:
+            return BatchAnswer(index=index, status_code=500, error=f"Unknown Error occured: {str(e)}")
+
+@router.post("/get_answers/batch", response_model=list[BatchAnswer])
+async def get_ai_answers_batch(
+    user_queries: list[SendPrompt],
+    concurrency: int = Query(AI_BATCH_CONCURRENCY, ge=1, le=64),
+    item_timeout: float = Query(AI_BATCH_ITEM_TIMEOUT, gt=0, le=300),
+    bypass_cache: bool = False,
+    stream: bool = False
+):
+    """Answer many prompts concurrently, in request order or as NDJSON when streamed"""
+    if not user_queries:
+        raise HTTPException(status_code=404, detail="No prompts found in your request")
+    if len(user_queries) > AI_BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"A batch can hold at most {AI_BATCH_MAX_ITEMS} prompts")
+    slots = asyncio.Semaphore(concurrency)
+    tasks = [
+        asyncio.ensure_future(answer_batch_item(i, query, bypass_cache, slots, item_timeout))
+        for i, query in enumerate(user_queries)
+    ]
+    if not stream:
+        return await asyncio.gather(*tasks)
+
+    async def partial_results():
+        try:
+            for finished in asyncio.as_completed(tasks):
+                yield (await finished).model_dump_json() + "\n"
+        finally:
+            for task in tasks:
+                task.cancel()
+    return StreamingResponse(partial_results(), media_type="application/x-ndjson")
+
+def sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+async def relay_answer(context: str, user_instructions: str, bypass_cache: bool):
+    if not bypass_cache:
+        cached = answer_cache.get_from_memory(context, user_instructions)
+        if cached is None:
+            cached = await run_in_threadpool(answer_cache.get, context, user_instructions)
+        if cached is not None:
+            yield sse_event("delta", {"text": cached})
+            yield sse_event("done", {"received_prompt": context, "answer": cached})
+            return
+    parts = []
+    try:
+        # async for text in stream_gemini(prompt=context, instruction=user_instructions):
+        async for text in stream_sarvam(prompt=context, instruction=user_instructions):
+            parts.append(text)
+            yield sse_event("delta", {"text": text})
+    except Exception as e:
+        yield sse_event("error", {"detail": f"[Sarvam Error] {str(e)}"})
+        return
+    answer = "".join(parts)
+    if answer:
+        # An empty stream would otherwise be served from the cache for the whole TTL.
+        await run_in_threadpool(answer_cache.set, context, user_instructions, answer)
+    yield sse_event("done", {"received_prompt": context, "answer": answer})
+
+@router.post("/get_answers/stream")
+async def stream_ai_answer(user_query: SendPrompt, bypass_cache: bool = False):
+    """Relay the answer as server-sent events: delta* then done (or error)"""
+    context, user_instructions = build_prompt(user_query)
+    return StreamingResponse(
+        relay_answer(context, user_instructions, bypass_cache),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/cache_stats", response_model=dict)
+def get_cache_stats():
+    return answer_cache.stats()
@@ -1,51 +1,106 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from database.database import SessionLocal, engine
-from schemas.scores import Score, ScoreCreate
-from crud import score_crud
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.database import AsyncSessionLocal, AsyncReadSessionLocal
+from typing import Optional
+from schemas.scores import Score, ScoreCreate, ScoreStats, LeaderboardPage, UserScores, ScoreRank
+from crud import async_score_crud as score_crud
 
 router = APIRouter(prefix="/scores", tags=["scores"])
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def get_read_db():
+    async with AsyncReadSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 @router.get("/", response_model=dict)
-def get_vocab_info(db: Session = Depends(get_db)):
+async def get_vocab_info(db: AsyncSession = Depends(get_read_db)):
     """Get information about the score endpoints"""
-    scores_count = len(score_crud.get_all_scores(db))
+    scores_count = await score_crud.count_scores(db)
     return {
         "api_active": True,
         "total_scores": scores_count,
         "endpoints": {
             "get all scores": "/scores/all_scores",
             "get high score": "/scores/high_score",
+            "get top scores": "/scores/top?k={k}",
+            "get leaderboard page": "/scores/leaderboard?page={page}&page_size={page_size}",
+            "get score stats": "/scores/stats",
+            "get scores of a user": "/scores/user/{username}",
+            "get best score per user": "/scores/best_per_user?limit={limit}",
+            "get rank of a score": "/scores/rank?score={score}",
+            "get rank of a user": "/scores/user/{username}/rank",
             "insert score": "/scores/insert_score/"
         }
     }
 
+@router.get("/stats", response_model=ScoreStats)
+async def get_score_stats(db: AsyncSession = Depends(get_read_db)):
+    return await score_crud.get_score_stats(db)
+
 @router.get("/all_scores", response_model=list[Score])
-def get_all_scores(db: Session = Depends(get_db)):
-    return score_crud.get_all_scores(db)
+async def get_all_scores(
+    offset: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1),
+    db: AsyncSession = Depends(get_read_db)
+):
+    return Response(content=await score_crud.get_all_scores_json(db, offset=offset, limit=limit), media_type="application/json")
+
+@router.get("/top", response_model=list[Score])
+async def get_top_scores(k: int = Query(10, ge=1, le=1000), db: AsyncSession = Depends(get_read_db)):
+    return Response(content=await score_crud.get_top_scores_json(db, k), media_type="application/json")
+
+@router.get("/leaderboard", response_model=LeaderboardPage)
+async def get_leaderboard(
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db)
+):
+    scores = await score_crud.get_all_scores(db, offset=(page - 1) * page_size, limit=page_size)
+    return LeaderboardPage(page=page, page_size=page_size, total=await score_crud.count_ranked_scores(db), scores=scores)
 
 @router.get("/high_score", response_model=Score)
-def get_high_score(db: Session = Depends(get_db)):
-    score = score_crud.get_high_score(db)
+async def get_high_score(db: AsyncSession = Depends(get_read_db)):
+    score = await score_crud.get_high_score(db)
     if not score:
         raise HTTPException(status_code=404, detail="No scores found")
     return score
 
+@router.get("/rank", response_model=ScoreRank)
+async def get_score_rank(score: int = Query(...), db: AsyncSession = Depends(get_read_db)):
+    """Rank of a score among all entries, percentile is the top share it falls in"""
+    return await score_crud.get_score_rank(db, score)
+
+@router.get("/user/{username}/rank", response_model=ScoreRank)
+async def get_user_rank(username: str, db: AsyncSession = Depends(get_read_db)):
+    """Rank of the best score of a user"""
+    rank = await score_crud.get_user_rank(db, username)
+    if rank is None:
+        raise HTTPException(status_code=404, detail=f"No score found for username: {username}")
+    return rank
+
+@router.get("/user/{username}", response_model=UserScores)
+async def get_user_scores(username: str, db: AsyncSession = Depends(get_read_db)):
+    """Get every score of a user (case-insensitive), best first"""
+    scores = await score_crud.get_scores_by_username(db, username)
+    if not scores:
+        raise HTTPException(status_code=404, detail=f"No score found for username: {username}")
+    return UserScores(username=username, games_played=len(scores), best_score=scores[0], scores=scores)
+
+@router.get("/best_per_user", response_model=list[Score])
+async def get_best_scores_per_user(limit: Optional[int] = Query(None, ge=1), db: AsyncSession = Depends(get_read_db)):
+    return await score_crud.get_best_scores_per_user(db, limit)
+
 @router.post("/insert_score", response_model=Score)
-def insert_score(score: ScoreCreate, db: Session = Depends(get_db)):
-    return score_crud.create_score(db, score)
+async def insert_score(score: ScoreCreate, db: AsyncSession = Depends(get_db)):
+    return await score_crud.create_score(db, score)
 
 @router.delete("/delete_score/{username}")
-def delete_score_by_username(username: str, db: Session = Depends(get_db)):
+async def delete_score_by_username(username: str, db: AsyncSession = Depends(get_db)):
     """Delete all score entries by username (case-insensitive)"""
-    deleted_count = score_crud.delete_score_by_username(db, username)
+    deleted_count = await score_crud.delete_score_by_username(db, username)
     if deleted_count == 0:
         raise HTTPException(status_code=404, detail=f"No score found for username: {username}")
     return {
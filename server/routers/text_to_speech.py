@@ -1,17 +1,34 @@
 from schemas.llm_client import TextToSpeechReq, TextToSpeechLLMRes, TextToSpeechRes
 from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from llm_client.sarvam_text_speech import sarvamTextToSpeech
+from services.tts_cache import audio_cache, tts_cache_key
+from services.singleflight import inflight
 
 router = APIRouter(prefix="/ai", tags=["artifial_intelligence"])
 
 
+async def synthesize(req: TextToSpeechReq):
+    """One provider call, shared by every identical request in flight"""
+    res = await sarvamTextToSpeech(req=req)
+    await run_in_threadpool(audio_cache.put, req, res)
+    return res
+
+
 @router.post("/text_to_speech", response_model=TextToSpeechRes)
-async def textToSpeechRouter(req: TextToSpeechReq):
+async def textToSpeechRouter(req: TextToSpeechReq, bypass_cache: bool = False):
     try:
-        res = await sarvamTextToSpeech(req=req)
+        res = None if bypass_cache else await run_in_threadpool(audio_cache.get, req)
+        if res is None:
+            res = await inflight.do(f"tts:{tts_cache_key(req)}", lambda: synthesize(req))
         return TextToSpeechRes(original_text=req.text, target_language=req.target_language, speaker=req.speaker, pace=req.pace, model=req.model, llm_res=res)
     except HTTPException:
         raise
     except Exception as e:
         print(str(e))
-        raise HTTPException(status_code=500, detail="Text to Speech Conversion process failed while routing request to llm")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Text to Speech Conversion process failed while routing request to llm")
+
+
+@router.get("/text_to_speech/cache_stats", response_model=dict)
+async def textToSpeechCacheStats():
+    return audio_cache.stats()
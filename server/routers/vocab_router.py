@@ -1,93 +1,315 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import Optional
-from schemas.vocab import VocabCreate, VocabUpdate, Vocab, VocabCount, VocabTypes
-from crud import vocab_crud
-from database.database import SessionLocal, engine
+import json
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, Response, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional, Union
+from schemas.vocab import VocabCreate, VocabUpdate, VocabBulkUpdate, VocabBulkWriteReport, Vocab, VocabCount, VocabTypes, VocabTypeCatalog, VocabStats, VocabSearchPage, VocabSuggestions
+from crud import async_vocab_crud as vocab_crud
+from crud.vocab_crud import build_match_query
+from database.database import AsyncSessionLocal, AsyncReadSessionLocal
+from services.vocab_version import vocab_version
+from services.vocab_io import VocabReader, detect_format, take, vocab_csv_chunk, vocab_jsonl_chunk
+
+VOCAB_IMPORT_MAX_ERRORS = 100
 
 router = APIRouter(
     prefix="/vocabs",
     tags=["vocabs"]
 )
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
-@router.get("/", response_model=dict)
-def get_vocab_info(db: Session = Depends(get_db)):
-    vocab_count = len(vocab_crud.get_all_vocab(db))
+async def get_read_db():
+    async with AsyncReadSessionLocal() as db:
+        yield db
+
+def _gzip_etag(etag: str) -> str:
+    # The gzip body is a different representation, so it needs its own strong tag.
+    return etag[:-1] + '-gz"'
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+def vocab_etag(request: Request, response: Response) -> str:
+    """Answer 304 when the client already holds the current vocab version, else tag the response"""
+    etag = vocab_version.etag()
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        for current in (etag, _gzip_etag(etag)):
+            if _etag_matches(if_none_match, current):
+                raise HTTPException(status_code=304, headers={"ETag": current, "Cache-Control": "no-cache"})
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    return etag
+
+def _stream_ndjson(db: AsyncSession, etag: str, word_type: Optional[str] = None):
+    async def rows():
+        async for batch in vocab_crud.iter_vocab_batches(db, word_type=word_type):
+            yield await run_in_threadpool(vocab_jsonl_chunk, batch)
+    return StreamingResponse(rows(), media_type="application/x-ndjson", headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+def _accepts_gzip(request: Request) -> bool:
+    for part in request.headers.get("accept-encoding", "").split(","):
+        coding, _, params = part.partition(";")
+        if coding.strip().lower() in ("gzip", "*"):
+            return params.replace(" ", "").rstrip("0").rstrip(".") not in ("q=", "q=0")
+    return False
+
+async def _snapshot_response(db: AsyncSession, request: Request, etag: str, word_type: Optional[str] = None):
+    """Serve a full list read from the pre-serialized snapshot, gzipped when the client accepts it"""
+    compressed = _accepts_gzip(request)
+    body = await vocab_crud.get_vocab_snapshot(db, word_type, compressed)
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    if compressed:
+        headers["ETag"] = _gzip_etag(etag)
+        headers["Content-Encoding"] = "gzip"
+    return Response(content=body, media_type="application/json", headers=headers)
+
+async def _read_page(db: AsyncSession, response: Response, after_id: Optional[int], limit: Optional[int], word_type: Optional[str] = None):
+    limit = limit or 100
+    page = await vocab_crud.get_vocab_page(db, after_id=after_id, limit=limit, word_type=word_type)
+    if len(page) == limit:
+        response.headers["X-Next-Cursor"] = str(page[-1].id)
+    return page
+
+@router.get("/", response_model=dict, dependencies=[Depends(vocab_etag)])
+async def get_vocab_info(db: AsyncSession = Depends(get_read_db)):
+    vocab_count = await vocab_crud.count_vocab(db)
     return {
         "api_active": True,
         "total_words": vocab_count,
         "endpoints": {
             "get all vocabs": "/vocabs/read",
+            "get vocabs page": "/vocabs/read?after_id={cursor}&limit={limit}",
+            "stream all vocabs": "/vocabs/read?stream=true",
             "get all vocab types": "/vocabs/read/vocab_types",
+            "get vocab types with counts": "/vocabs/read/vocab_types?with_counts=true",
             "get vocabs by type": "/vocabs/read/{word_type}/{word_count}",
             "get count for vocab types": "/vocabs/read/count/{word_type}",
+            "get random vocabs by type": "/vocabs/random/{word_type}?k={k}",
+            "search vocabs": "/vocabs/search?q={query}&limit={limit}&offset={offset}",
+            "autocomplete words": "/vocabs/autocomplete?prefix={prefix}&limit={limit}",
+            "get vocab stats": "/vocabs/stats",
             "create vocab": "/vocabs/create",
-            "update vocab": "/vocabs/update/{word}"
+            "update vocab": "/vocabs/update/{word}",
+            "bulk update vocabs": "/vocabs/bulk_update",
+            "upsert vocabs": "/vocabs/upsert",
+            "import vocabs": "/vocabs/import?format={csv|jsonl}",
+            "export vocabs": "/vocabs/export?format={csv|jsonl}"
         }
     }
 
+@router.get("/stats", response_model=VocabStats, dependencies=[Depends(vocab_etag)])
+async def get_vocab_stats(db: AsyncSession = Depends(get_read_db)):
+    return await vocab_crud.get_vocab_stats(db)
+
 @router.post("/create", response_model=Vocab)
-def create_vocab(vocab: VocabCreate, db: Session = Depends(get_db)):
-    existing = vocab_crud.get_vocab_by_word(db, vocab.word)
+async def create_vocab(vocab: VocabCreate, db: AsyncSession = Depends(get_db)):
+    existing = await vocab_crud.get_vocab_by_word(db, vocab.word)
     if existing:
         raise HTTPException(status_code=400, detail="Word already exists")
-    return vocab_crud.create_vocab(db, vocab)
+    return await vocab_crud.create_vocab(db, vocab)
 
 @router.post("/bulk_create", response_model=dict)
-def bulk_create_vocab(vocabs: list[VocabCreate], db: Session = Depends(get_db)):
+async def bulk_create_vocab(vocabs: list[VocabCreate], db: AsyncSession = Depends(get_db)):
     if not vocabs:
         raise HTTPException(status_code=404, detail="No vocabs found in your request")
     words_received = len(vocabs)
-    inserted_count = 0
-    existing_words = set()
     try:
-        for vocab in vocabs:
-            if not vocab:
-                continue
-            existing = vocab_crud.get_vocab_by_word(db, vocab.word)
-            if existing:
-                existing_words.add(vocab.word)
-            else:
-                status = vocab_crud.create_vocab(db, vocab)
-                inserted_count += 1
-        return {
-            "words_received": words_received,
-            "words_inserted": inserted_count,
-            "existing_words": existing_words if existing_words else "none" 
-        }
+        report = await vocab_crud.bulk_create_vocab(db, vocabs)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"unexpected error: {str(e)}, records inserted: {inserted_count}")
+        raise HTTPException(status_code=500, detail=f"unexpected error: {str(e)}, records inserted: 0")
+    return {
+        "words_received": words_received,
+        "words_inserted": report["words_inserted"],
+        "existing_words": report["existing_words"] if report["existing_words"] else "none",
+        "elapsed_ms": report["elapsed_ms"],
+        "words_per_second": report["words_per_second"]
+    }
 
 @router.get("/read", response_model=list[Vocab])
-def read_vocabs(db: Session = Depends(get_db)):
-    return vocab_crud.get_all_vocab(db)
+async def read_vocabs(
+    request: Request,
+    response: Response,
+    after_id: Optional[int] = None,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    stream: bool = False,
+    etag: str = Depends(vocab_etag),
+    db: AsyncSession = Depends(get_read_db)
+):
+    if stream:
+        return _stream_ndjson(db, etag)
+    if after_id is not None or limit is not None:
+        return await _read_page(db, response, after_id, limit)
+    return await _snapshot_response(db, request, etag)
 
-@router.get("/read/vocab_types", response_model=VocabTypes)
-def read_vocab_types(db: Session = Depends(get_db)):
-    return vocab_crud.get_all_word_types(db)
+@router.get("/read/vocab_types", response_model=Union[VocabTypes, VocabTypeCatalog], dependencies=[Depends(vocab_etag)])
+async def read_vocab_types(with_counts: bool = False, db: AsyncSession = Depends(get_read_db)):
+    if with_counts:
+        return await vocab_crud.get_word_type_catalog(db)
+    return await vocab_crud.get_all_word_types(db)
 
 @router.get("/read/{word_type}", response_model=list[Vocab])
-def get_vocab_list_with_type(word_type: str, word_count: Optional[int] = None, db: Session = Depends(get_db)):
+async def get_vocab_list_with_type(
+    word_type: str,
+    request: Request,
+    response: Response,
+    word_count: Optional[int] = None,
+    after_id: Optional[int] = None,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    stream: bool = False,
+    etag: str = Depends(vocab_etag),
+    db: AsyncSession = Depends(get_read_db)
+):
     if not word_type or len(word_type.strip()) == 0:
         raise HTTPException(status_code=400, detail="Invalid word type")
-    return vocab_crud.get_vocab_by_type(db, word_type, word_count)
+    if stream:
+        return _stream_ndjson(db, etag, word_type=word_type)
+    if after_id is not None or limit is not None:
+        return await _read_page(db, response, after_id, limit, word_type=word_type)
+    if word_count:
+        body = await vocab_crud.get_vocab_json(db, word_type, word_count)
+        return Response(content=body, media_type="application/json", headers={"ETag": etag, "Cache-Control": "no-cache"})
+    return await _snapshot_response(db, request, etag, word_type=word_type)
+
+@router.get("/search", response_model=VocabSearchPage, dependencies=[Depends(vocab_etag)])
+async def search_vocabs(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_read_db),
+):
+    if build_match_query(q) is None:
+        raise HTTPException(status_code=400, detail="Search query has no searchable terms")
+    page = await vocab_crud.search_vocab(db, q, limit, offset)
+    return {"query": q, "total": page["total"], "limit": limit, "offset": offset, "results": page["results"]}
 
-@router.get("/read/count/{word_type}", response_model=VocabCount)
-def get_vocab_count_by_type(word_type: str, db: Session = Depends(get_db)):
+@router.get("/autocomplete", response_model=VocabSuggestions, dependencies=[Depends(vocab_etag)])
+async def autocomplete_vocabs(
+    prefix: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_read_db),
+):
+    return {"prefix": prefix, "words": await vocab_crud.autocomplete_vocab(db, prefix, limit)}
+
+@router.get("/random/{word_type}", response_model=list[Vocab])
+async def get_random_vocabs_with_type(word_type: str, k: int = Query(10, ge=1, le=100), db: AsyncSession = Depends(get_read_db)):
     if not word_type or len(word_type.strip()) == 0:
         raise HTTPException(status_code=400, detail="Invalid word type")
-    return vocab_crud.get_vocab_by_count(db=db, word_type=word_type)
+    return await vocab_crud.sample_vocab_by_type(db, word_type, k)
+
+@router.get("/read/count/{word_type}", response_model=VocabCount, dependencies=[Depends(vocab_etag)])
+async def get_vocab_count_by_type(word_type: str, db: AsyncSession = Depends(get_read_db)):
+    if not word_type or len(word_type.strip()) == 0:
+        raise HTTPException(status_code=400, detail="Invalid word type")
+    return await vocab_crud.get_vocab_by_count(db=db, word_type=word_type)
 
 @router.put("/update/{word}", response_model=Vocab)
-def update_vocab(word: str, vocab_update: VocabUpdate, db: Session = Depends(get_db)):
-    db_vocab = vocab_crud.get_vocab_by_word(db, word)
+async def update_vocab(word: str, vocab_update: VocabUpdate, db: AsyncSession = Depends(get_db)):
+    db_vocab = await vocab_crud.get_vocab_by_word(db, word)
     if not db_vocab:
         raise HTTPException(status_code=404, detail="Word not found")
-    return vocab_crud.update_vocab(db, db_vocab, vocab_update)
\ No newline at end of file
+    return await vocab_crud.update_vocab(db, db_vocab, vocab_update)
+
+@router.post("/bulk_update", response_model=VocabBulkWriteReport)
+async def bulk_update_vocab(updates: list[VocabBulkUpdate], db: AsyncSession = Depends(get_db)):
+    if not updates:
+        raise HTTPException(status_code=404, detail="No vocabs found in your request")
+    try:
+        report = await vocab_crud.bulk_update_vocab(db, updates)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"unexpected error: {str(e)}, records updated: 0")
+    return {"words_received": len(updates), **report}
+
+@router.post("/upsert", response_model=VocabBulkWriteReport)
+async def upsert_vocab(vocabs: list[VocabCreate], db: AsyncSession = Depends(get_db)):
+    if not vocabs:
+        raise HTTPException(status_code=404, detail="No vocabs found in your request")
+    try:
+        report = await vocab_crud.upsert_vocab(db, vocabs)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"unexpected error: {str(e)}, records written: 0")
+    return {"words_received": len(vocabs), **report}
+
+async def _import_progress(db: AsyncSession, reader: VocabReader, upsert: bool, chunk_size: int):
+    """Parse, write and commit the upload chunk by chunk, reporting totals as NDJSON after each chunk"""
+    totals = {"rows_read": 0, "words_inserted": 0, "words_updated": 0, "words_skipped": 0, "invalid_rows": 0}
+    errors = []
+    rows = iter(reader)
+    try:
+        while True:
+            chunk = await run_in_threadpool(take, rows, chunk_size)
+            if not chunk:
+                break
+            vocabs = []
+            for line, vocab, error in chunk:
+                if error is None:
+                    vocabs.append(vocab)
+                    continue
+                totals["invalid_rows"] += 1
+                if len(errors) < VOCAB_IMPORT_MAX_ERRORS:
+                    errors.append({"line": line, "error": error})
+            totals["rows_read"] += len(chunk)
+            if vocabs:
+                if upsert:
+                    report = await vocab_crud.upsert_vocab(db, vocabs)
+                else:
+                    report = await vocab_crud.bulk_create_vocab(db, vocabs)
+                inserted, updated = report["words_inserted"], report.get("words_updated", 0)
+                totals["words_inserted"] += inserted
+                totals["words_updated"] += updated
+                totals["words_skipped"] += len(vocabs) - inserted - updated
+            yield json.dumps({"event": "progress", **totals}) + "\n"
+        yield json.dumps({"event": "done", **totals, "errors": errors}) + "\n"
+    except Exception as e:
+        # Earlier chunks stay committed, the totals say how far the import got.
+        yield json.dumps({"event": "error", "detail": f"unexpected error: {str(e)}", **totals, "errors": errors}) + "\n"
+
+@router.post("/import")
+async def import_vocabs(
+    file: UploadFile = File(...),
+    fmt: Optional[str] = Query(None, alias="format", pattern="^(csv|jsonl)$"),
+    upsert: bool = False,
+    chunk_size: int = Query(1000, ge=1, le=10000),
+    db: AsyncSession = Depends(get_db)
+):
+    """Import a CSV or JSONL dictionary, committing every chunk_size rows and streaming progress as NDJSON"""
+    fmt = detect_format(file.filename, fmt)
+    if fmt is None:
+        raise HTTPException(status_code=400, detail="Unsupported import format, use csv or jsonl")
+    reader = VocabReader(file.file, fmt)
+    missing = await run_in_threadpool(reader.missing_columns)
+    if missing:
+        raise HTTPException(status_code=400, detail=f"CSV header is missing column(s): {', '.join(missing)}")
+    return StreamingResponse(_import_progress(db, reader, upsert, chunk_size), media_type="application/x-ndjson")
+
+@router.get("/export")
+async def export_vocabs(
+    fmt: str = Query("jsonl", alias="format", pattern="^(csv|jsonl)$"),
+    etag: str = Depends(vocab_etag),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Stream the whole dictionary as CSV or JSONL, batch by batch from the database"""
+    async def rows():
+        # Batches are formatted in the threadpool so the loop keeps serving other requests.
+        header = fmt == "csv"
+        async for batch in vocab_crud.iter_vocab_batches(db):
+            if fmt == "csv":
+                yield await run_in_threadpool(vocab_csv_chunk, batch, header)
+                header = False
+            else:
+                yield await run_in_threadpool(vocab_jsonl_chunk, batch)
+        if header:
+            yield vocab_csv_chunk([], header=True)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "no-cache",
+        "Content-Disposition": f'attachment; filename="vocabs.{fmt}"',
+    }
+    media_type = "text/csv" if fmt == "csv" else "application/x-ndjson"
+    return StreamingResponse(rows(), media_type=media_type, headers=headers)
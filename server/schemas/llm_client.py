@@ -13,6 +13,13 @@ class GetAnswers(BaseModel):
     received_prompt: str
     answer: str
 
+class BatchAnswer(BaseModel):
+    index: int
+    status_code: int
+    received_prompt: Optional[str] = None
+    answer: Optional[str] = None
+    error: Optional[str] = None
+
 class ClientResponse(BaseModel):
     status_code: int
     details: str
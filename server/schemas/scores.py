@@ -9,9 +9,34 @@ class ScoreBase(BaseModel):
 class ScoreCreate(ScoreBase):
     pass
 
+class ScoreStats(BaseModel):
+    total_scores: int
+    total_points: int
+    highest_score: Optional[int] = None
+    lowest_score: Optional[int] = None
+    total_players: int
+
 class Score(ScoreBase):
     id: int
     date_created: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class ScoreRank(BaseModel):
+    score: int
+    rank: int
+    total: int
+    percentile: float
+
+class UserScores(BaseModel):
+    username: str
+    games_played: int
+    best_score: Score
+    scores: list[Score]
+
+class LeaderboardPage(BaseModel):
+    page: int
+    page_size: int
+    total: int
+    scores: list[Score]
@@ -26,11 +26,32 @@ class VocabCount(BaseModel):
 class VocabTypes(BaseModel):
     word_types: list[str]
 
+class VocabTypeCatalog(BaseModel):
+    word_types: list[VocabCount]
+
+class VocabStats(BaseModel):
+    total_words: int
+    word_types: dict[str, int]
+
 class VocabUpdate(BaseModel):
     word_type: Optional[str] = None
     meaning: Optional[str] = None
     example: Optional[str] = None
 
+class VocabBulkUpdate(VocabUpdate):
+    word: str
+
+class VocabWriteResult(BaseModel):
+    word: str
+    status: str
+
+class VocabBulkWriteReport(BaseModel):
+    words_received: int
+    words_inserted: int = 0
+    words_updated: int
+    elapsed_ms: float
+    results: list[VocabWriteResult]
+
 class Vocab(VocabBase):
     id: int
     created_at: datetime
@@ -39,3 +60,18 @@ class Vocab(VocabBase):
     class Config:
         from_attributes = True
 
+class VocabSuggestions(BaseModel):
+    prefix: str
+    words: list[str]
+
+class VocabSearchHit(Vocab):
+    rank: float
+    snippet: str
+
+class VocabSearchPage(BaseModel):
+    query: str
+    total: int
+    limit: int
+    offset: int
+    results: list[VocabSearchHit]
+
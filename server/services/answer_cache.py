@@ -0,0 +1,177 @@
+import os
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional
+from sqlalchemy import create_engine, MetaData, Table, Column, String, Float, select, delete, func
+from sqlalchemy.dialects.sqlite import insert
+
+LLM_CACHE_DB_URL = os.getenv("LLM_CACHE_DB_URL", "sqlite:///./database/llm_cache.db")
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "2048"))
+LLM_CACHE_TTL_SECONDS = float(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+LLM_CACHE_MAX_DISK_ENTRIES = int(os.getenv("LLM_CACHE_MAX_DISK_ENTRIES", "50000"))
+LLM_CACHE_PURGE_EVERY = int(os.getenv("LLM_CACHE_PURGE_EVERY", "256"))
+
+metadata = MetaData()
+
+answers_table = Table(
+    "llm_answer_cache",
+    metadata,
+    Column("key", String, primary_key=True),
+    Column("answer", String, nullable=False),
+    Column("expires_at", Float, nullable=False, index=True),
+)
+
+
+def normalize(text: Optional[str]) -> str:
+    return " ".join((text or "").split()).lower()
+
+
+def cache_key(context: str, instruction: str) -> str:
+    raw = "\x00".join([normalize(context), normalize(instruction)])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class AnswerCache:
+    """Two tier cache for LLM answers.
+
+    The first tier is an in-process LRU with a TTL, the second one is a
+    SQLite table that survives restarts. Disk hits are promoted to memory.
+    The table is purged every purge_every writes: expired rows go first,
+    then the oldest ones beyond max_disk_entries.
+    """
+
+    def __init__(
+        self,
+        db_url: str = LLM_CACHE_DB_URL,
+        max_entries: int = LLM_CACHE_MAX_ENTRIES,
+        ttl: float = LLM_CACHE_TTL_SECONDS,
+        max_disk_entries: int = LLM_CACHE_MAX_DISK_ENTRIES,
+        purge_every: int = LLM_CACHE_PURGE_EVERY,
+    ):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._engine = None
+        self._writes = 0
+        self.db_url = db_url
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_disk_entries = max_disk_entries
+        self.purge_every = purge_every
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def configure(
+        self,
+        db_url: str = LLM_CACHE_DB_URL,
+        max_entries: int = LLM_CACHE_MAX_ENTRIES,
+        ttl: float = LLM_CACHE_TTL_SECONDS,
+        max_disk_entries: int = LLM_CACHE_MAX_DISK_ENTRIES,
+        purge_every: int = LLM_CACHE_PURGE_EVERY,
+    ):
+        """Point the cache at another store and start from an empty state"""
+        with self._lock:
+            if self._engine is not None:
+                self._engine.dispose()
+                self._engine = None
+            self.db_url = db_url
+            self.max_entries = max_entries
+            self.ttl = ttl
+            self.max_disk_entries = max_disk_entries
+            self.purge_every = purge_every
+            self._writes = 0
+            self._entries.clear()
+            self.memory_hits = self.disk_hits = self.misses = 0
+
+    def _get_engine(self):
+        if self._engine is None:
+            self._engine = create_engine(self.db_url, connect_args={"check_same_thread": False})
+            metadata.create_all(bind=self._engine)
+        return self._engine
+
+    def _remember(self, key: str, answer: str, expires_at: float):
+        self._entries[key] = (answer, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _memory_lookup(self, key: str, now: float) -> Optional[str]:
+        cached = self._entries.get(key)
+        if cached is None:
+            return None
+        if cached[1] <= now:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        self.memory_hits += 1
+        return cached[0]
+
+    def get_from_memory(self, context: str, instruction: str) -> Optional[str]:
+        """Memory tier only lookup, safe to call from the event loop"""
+        with self._lock:
+            return self._memory_lookup(cache_key(context, instruction), time.time())
+
+    def get(self, context: str, instruction: str) -> Optional[str]:
+        key = cache_key(context, instruction)
+        now = time.time()
+        with self._lock:
+            cached = self._memory_lookup(key, now)
+            if cached is not None:
+                return cached
+            engine = self._get_engine()
+        with engine.connect() as conn:
+            row = conn.execute(
+                select(answers_table.c.answer, answers_table.c.expires_at).where(answers_table.c.key == key)
+            ).first()
+        with self._lock:
+            if row is None or row.expires_at <= now:
+                self.misses += 1
+                return None
+            self._remember(key, row.answer, row.expires_at)
+            self.disk_hits += 1
+            return row.answer
+
+    def set(self, context: str, instruction: str, answer: str):
+        key = cache_key(context, instruction)
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            self._remember(key, answer, expires_at)
+            engine = self._get_engine()
+            self._writes += 1
+            purge = self._writes % self.purge_every == 0
+        stmt = insert(answers_table).values(key=key, answer=answer, expires_at=expires_at)
+        stmt = stmt.on_conflict_do_update(index_elements=["key"], set_={"answer": answer, "expires_at": expires_at})
+        with engine.begin() as conn:
+            conn.execute(stmt)
+        if purge:
+            self.purge_expired()
+
+    def purge_expired(self) -> int:
+        """Delete expired rows, then the oldest ones over max_disk_entries"""
+        with self._lock:
+            engine = self._get_engine()
+        with engine.begin() as conn:
+            removed = conn.execute(delete(answers_table).where(answers_table.c.expires_at <= time.time())).rowcount
+            excess = conn.execute(select(func.count()).select_from(answers_table)).scalar_one() - self.max_disk_entries
+            if excess > 0:
+                # Every row shares the same TTL, so the earliest expiry is the oldest write.
+                oldest = select(answers_table.c.key).order_by(answers_table.c.expires_at).limit(excess)
+                removed += conn.execute(delete(answers_table).where(answers_table.c.key.in_(oldest))).rowcount
+            return removed
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            hits = self.memory_hits + self.disk_hits
+            return {
+                "memory_entries": len(self._entries),
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+answer_cache = AnswerCache()
@@ -0,0 +1,172 @@
+import os
+import json
+import asyncio
+import traceback
+from typing import Optional
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+from database.database import SessionLocal
+from models.vocab import EnglishVocab
+from models.enrichment import EnrichmentCheckpoint
+from crud import vocab_crud
+from llm_client.sarvam_ai import ask_sarvam_async
+
+ENRICHMENT_ENABLED = os.getenv("ENRICHMENT_ENABLED", "false").lower() == "true"
+ENRICHMENT_BATCH_SIZE = int(os.getenv("ENRICHMENT_BATCH_SIZE", "25"))
+ENRICHMENT_IDLE_SECONDS = float(os.getenv("ENRICHMENT_IDLE_SECONDS", "3600"))
+ENRICHMENT_RETRY_SECONDS = float(os.getenv("ENRICHMENT_RETRY_SECONDS", "60"))
+ENRICHMENT_MAX_ATTEMPTS = int(os.getenv("ENRICHMENT_MAX_ATTEMPTS", "3"))
+CHECKPOINT_NAME = "vocab_meaning_example"
+
+ENRICHMENT_INSTRUCTION = (
+    "You are a english professor. For every word in the given JSON list write a short meaning "
+    "and one example sentence. Reply with a single JSON object only, mapping each word to "
+    '{"meaning": "...", "example": "..."}. Nothing extra.'
+)
+
+
+# Failed attempts per checkpoint, so a batch the LLM cannot answer is not retried forever
+_failed_attempts: dict[int, int] = {}
+
+
+def reset_failed_attempts():
+    _failed_attempts.clear()
+
+
+def get_checkpoint(db: Session) -> int:
+    checkpoint = db.get(EnrichmentCheckpoint, CHECKPOINT_NAME)
+    return checkpoint.last_id if checkpoint else 0
+
+
+def save_checkpoint(db: Session, last_id: int):
+    """Stage the checkpoint, it is committed together with the next write"""
+    db.merge(EnrichmentCheckpoint(name=CHECKPOINT_NAME, last_id=last_id))
+
+
+def reset_checkpoint(db: Session):
+    save_checkpoint(db, 0)
+    db.commit()
+
+
+def fetch_pending(db: Session, after_id: int, limit: int):
+    return (
+        db.query(EnglishVocab)
+        .filter(EnglishVocab.id > after_id)
+        .filter(or_(EnglishVocab.meaning.is_(None), EnglishVocab.example.is_(None)))
+        .order_by(EnglishVocab.id)
+        .limit(limit)
+        .all()
+    )
+
+
+def build_enrichment_prompt(rows) -> str:
+    return json.dumps([{"word": row.word, "word_type": row.word_type} for row in rows])
+
+
+def parse_enrichment_answer(answer: str) -> dict:
+    """Pull the JSON object out of the answer, tolerating code fences or chatter around it.
+
+    Only string meanings and examples are kept, anything else the LLM sends is dropped.
+    """
+    start, end = answer.find("{"), answer.rfind("}")
+    if start == -1 or end <= start:
+        raise ValueError("No JSON object in enrichment answer")
+    parsed = json.loads(answer[start:end + 1])
+    if not isinstance(parsed, dict):
+        raise ValueError("Enrichment answer is not a JSON object")
+    answers = {}
+    for word, value in parsed.items():
+        if isinstance(value, dict):
+            answers[word.lower()] = {
+                field: value[field] for field in ("meaning", "example") if isinstance(value.get(field), str)
+            }
+    return answers
+
+
+def write_batch(db: Session, rows, answers: dict, last_id: int) -> int:
+    fills = []
+    for row in rows:
+        found = answers.get(row.word.lower())
+        if not found:
+            continue
+        meaning, example = found.get("meaning"), found.get("example")
+        if meaning or example:
+            fills.append({"id": row.id, "meaning": meaning or None, "example": example or None})
+    save_checkpoint(db, last_id)
+    if not fills:
+        db.commit()
+        return 0
+    return vocab_crud.fill_missing_fields(db, fills)
+
+
+async def enrich_batch(
+    db: Session,
+    ask=ask_sarvam_async,
+    batch_size: int = ENRICHMENT_BATCH_SIZE,
+    max_attempts: int = ENRICHMENT_MAX_ATTEMPTS,
+) -> Optional[dict]:
+    """Enrich the next batch after the checkpoint, None once every row has been visited.
+
+    A batch that keeps failing is skipped after max_attempts tries.
+    """
+    after_id = await run_in_threadpool(get_checkpoint, db)
+    rows = await run_in_threadpool(fetch_pending, db, after_id, batch_size)
+    if not rows:
+        await run_in_threadpool(reset_checkpoint, db)
+        return None
+    try:
+        response = await ask(prompt=build_enrichment_prompt(rows), instruction=ENRICHMENT_INSTRUCTION)
+        if response.status_code != 200:
+            raise RuntimeError(f"Enrichment request failed: {response.details}")
+        answers = parse_enrichment_answer(response.details)
+        updated = await run_in_threadpool(write_batch, db, rows, answers, rows[-1].id)
+    except Exception:
+        await run_in_threadpool(db.rollback)
+        attempts = _failed_attempts.get(after_id, 0) + 1
+        if attempts < max_attempts:
+            _failed_attempts[after_id] = attempts
+            raise
+        # Give up on this batch and move the checkpoint past it. The rows
+        # are picked up again on the next pass.
+        _failed_attempts.pop(after_id, None)
+        traceback.print_exc()
+        await run_in_threadpool(write_batch, db, rows, {}, rows[-1].id)
+        return {"scanned": len(rows), "updated": 0, "last_id": rows[-1].id, "skipped": True}
+    _failed_attempts.pop(after_id, None)
+    return {"scanned": len(rows), "updated": updated, "last_id": rows[-1].id, "skipped": False}
+
+
+async def run_enrichment_worker():
+    """Walk the table batch by batch, then sleep until new gaps may have appeared"""
+    while True:
+        try:
+            with SessionLocal() as db:
+                report = await enrich_batch(db)
+            if report is None:
+                await asyncio.sleep(ENRICHMENT_IDLE_SECONDS)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            traceback.print_exc()
+            await asyncio.sleep(ENRICHMENT_RETRY_SECONDS)
+
+
+_worker: Optional[asyncio.Task] = None
+
+
+def start_enrichment_worker():
+    global _worker
+    if ENRICHMENT_ENABLED and _worker is None:
+        _worker = asyncio.get_running_loop().create_task(run_enrichment_worker())
+
+
+async def stop_enrichment_worker():
+    global _worker
+    if _worker is not None:
+        _worker.cancel()
+        try:
+            await _worker
+        except asyncio.CancelledError:
+            pass
+        _worker = None
@@ -0,0 +1,66 @@
+import threading
+from sqlalchemy.orm import Session
+
+
+class LazyIndex:
+    """Base of the in-memory structures seeded from the database on first use.
+
+    load runs the query without holding the lock: under AsyncSession.run_sync
+    it awaits on the event loop thread, so blocking on the lock there would
+    stall every request. Writes that land while a load is running are
+    recorded with _record and replayed onto the fresh state before it is
+    swapped in, so the replay must be idempotent.
+
+    Subclasses implement _fetch (query and build, no lock held), _install
+    (replay the recorded writes and swap the state in, lock held) and _reset.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = None
+        self._loads = 0
+        self.loaded = False
+
+    def _fetch(self, db: Session):
+        raise NotImplementedError
+
+    def _install(self, state, pending: list):
+        raise NotImplementedError
+
+    def _reset(self):
+        raise NotImplementedError
+
+    def _record(self, *writes):
+        """Keep writes for the loads in flight, call with the lock held"""
+        if self._pending is not None:
+            self._pending.extend(writes)
+
+    def _end_load(self):
+        self._loads -= 1
+        if self._loads == 0:
+            self._pending = None
+
+    def load(self, db: Session):
+        with self._lock:
+            self._loads += 1
+            if self._pending is None:
+                self._pending = []
+        try:
+            state = self._fetch(db)
+        except Exception:
+            with self._lock:
+                self._end_load()
+            raise
+        with self._lock:
+            self._install(state, self._pending)
+            self._end_load()
+            self.loaded = True
+
+    def ensure_loaded(self, db: Session):
+        if not self.loaded:
+            self.load(db)
+
+    def clear(self):
+        with self._lock:
+            self._reset()
+            self.loaded = False
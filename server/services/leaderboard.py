@@ -0,0 +1,80 @@
+from bisect import bisect_left, insort
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from models.scores import ScoreSheet
+from schemas.scores import Score
+from services.lazy_index import LazyIndex
+
+
+class Leaderboard(LazyIndex):
+    """Score entries kept sorted in memory, highest score first.
+
+    Entries are ordered by (-high_score, id) so ties keep insertion order.
+    The board is seeded once from the high_score table and then kept in
+    sync by score_crud on every insert and delete.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._keys = []
+        self._entries = {}
+
+    def _fetch(self, db: Session):
+        rows = db.execute(select(*(ScoreSheet.__table__.c[name] for name in Score.model_fields))).mappings().all()
+        return {row["id"]: Score.model_validate(row) for row in rows}
+
+    def _install(self, entries: dict, pending: list):
+        for op, value in pending:
+            if op == "add":
+                entries.setdefault(value.id, value)
+            else:
+                entries.pop(value, None)
+        self._entries = entries
+        self._keys = sorted((-e.high_score, e.id) for e in entries.values())
+
+    def _reset(self):
+        self._entries = {}
+        self._keys = []
+
+    def add(self, entry: Score):
+        with self._lock:
+            self._record(("add", entry))
+            if not self.loaded or entry.id in self._entries:
+                return
+            self._entries[entry.id] = entry
+            insort(self._keys, (-entry.high_score, entry.id))
+
+    def remove(self, ids):
+        with self._lock:
+            for entry_id in ids:
+                self._record(("remove", entry_id))
+                entry = self._entries.pop(entry_id, None)
+                if entry is None:
+                    continue
+                key = (-entry.high_score, entry.id)
+                del self._keys[bisect_left(self._keys, key)]
+
+    def high_score(self):
+        with self._lock:
+            if not self._keys:
+                return None
+            return self._entries[self._keys[0][1]]
+
+    def top(self, k: int):
+        return self.page(0, k)
+
+    def page(self, offset: int, limit: int = None):
+        with self._lock:
+            end = None if limit is None else offset + limit
+            return [self._entries[entry_id] for _, entry_id in self._keys[offset:end]]
+
+    def rank(self, score: int):
+        """Competition rank of a score (ties share a rank) and the board size"""
+        with self._lock:
+            return bisect_left(self._keys, (-score,)) + 1, len(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+
+leaderboard = Leaderboard()
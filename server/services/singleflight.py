@@ -0,0 +1,29 @@
+import asyncio
+from typing import Awaitable, Callable
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key into one execution.
+
+    The first caller starts the work as its own task; later callers with the
+    same key await that task while it is in flight. Every waiter gets the same
+    result or exception, and a caller that disconnects does not cancel the
+    work for the others.
+    """
+
+    def __init__(self):
+        self._calls = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable]):
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+        return await asyncio.shield(task)
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+
+inflight = SingleFlight()
@@ -0,0 +1,129 @@
+import os
+import json
+import base64
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional
+from schemas.llm_client import TextToSpeechReq, TextToSpeechLLMRes
+
+TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR", "./database/tts_cache")
+TTS_CACHE_MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+
+def tts_cache_key(req: TextToSpeechReq) -> str:
+    raw = json.dumps([req.text, req.target_language, req.speaker, req.model, req.pace])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class AudioCache:
+    """Size bounded LRU of decoded TTS audio stored on local disk.
+
+    Every clip of a response is written to <key>-<n>.audio. The LRU index
+    lives in memory and is rebuilt from the directory (oldest mtime first)
+    the first time the cache is used.
+    """
+
+    def __init__(self, directory: str = TTS_CACHE_DIR, max_bytes: int = TTS_CACHE_MAX_BYTES):
+        self._lock = threading.Lock()
+        self._index = OrderedDict()
+        self._loaded = False
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def configure(self, directory: str = TTS_CACHE_DIR, max_bytes: int = TTS_CACHE_MAX_BYTES):
+        with self._lock:
+            self.directory = directory
+            self.max_bytes = max_bytes
+            self._index.clear()
+            self._loaded = False
+            self.total_bytes = 0
+            self.hits = self.misses = 0
+
+    def _path(self, key: str, n: int) -> str:
+        return os.path.join(self.directory, f"{key}-{n}.audio")
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        entries = {}
+        for name in os.listdir(self.directory):
+            if not name.endswith(".audio"):
+                continue
+            key = name.rsplit("-", 1)[0]
+            stat = os.stat(os.path.join(self.directory, name))
+            size, clips, mtime = entries.get(key, (0, 0, 0))
+            entries[key] = (size + stat.st_size, clips + 1, max(mtime, stat.st_mtime))
+        for key, (size, clips, _) in sorted(entries.items(), key=lambda item: item[1][2]):
+            self._index[key] = (size, clips)
+            self.total_bytes += size
+        self._loaded = True
+
+    def _evict(self):
+        while self.total_bytes > self.max_bytes and self._index:
+            key, (size, clips) = self._index.popitem(last=False)
+            self.total_bytes -= size
+            for n in range(clips):
+                try:
+                    os.remove(self._path(key, n))
+                except FileNotFoundError:
+                    pass
+
+    def get(self, req: TextToSpeechReq) -> Optional[TextToSpeechLLMRes]:
+        key = tts_cache_key(req)
+        with self._lock:
+            self._ensure_loaded()
+            entry = self._index.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            try:
+                audio = []
+                for n in range(entry[1]):
+                    with open(self._path(key, n), "rb") as f:
+                        audio.append(base64.b64encode(f.read()).decode("ascii"))
+            except FileNotFoundError:
+                del self._index[key]
+                self.total_bytes -= entry[0]
+                self.misses += 1
+                return None
+            self._index.move_to_end(key)
+            self.hits += 1
+            return TextToSpeechLLMRes(req_id=None, audio=audio)
+
+    def put(self, req: TextToSpeechReq, res: TextToSpeechLLMRes):
+        key = tts_cache_key(req)
+        blobs = [base64.b64decode(clip) for clip in res.audio]
+        with self._lock:
+            self._ensure_loaded()
+            if key in self._index:
+                self._index.move_to_end(key)
+                return
+            for n, blob in enumerate(blobs):
+                tmp_path = self._path(key, n) + ".tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(blob)
+                os.replace(tmp_path, self._path(key, n))
+            size = sum(len(blob) for blob in blobs)
+            self._index[key] = (size, len(blobs))
+            self.total_bytes += size
+            self._evict()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._index),
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+audio_cache = AudioCache()
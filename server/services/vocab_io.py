@@ -0,0 +1,113 @@
+import io
+import csv
+import json
+import codecs
+from itertools import islice
+from typing import BinaryIO, Iterator, Optional
+from pydantic import ValidationError
+from schemas.vocab import Vocab, VocabCreate
+
+VOCAB_IO_FORMATS = ("csv", "jsonl")
+VOCAB_CSV_COLUMNS = tuple(Vocab.model_fields)
+VOCAB_IMPORT_FIELDS = tuple(VocabCreate.model_fields)
+
+_EXTENSIONS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+
+def detect_format(filename: Optional[str], requested: Optional[str] = None) -> Optional[str]:
+    """Use the requested format, else guess it from the file extension"""
+    if requested:
+        return requested if requested in VOCAB_IO_FORMATS else None
+    name = (filename or "").lower()
+    for extension, fmt in _EXTENSIONS.items():
+        if name.endswith(extension):
+            return fmt
+    return None
+
+
+class VocabReader:
+    """Incremental parser of an uploaded CSV or JSONL dictionary.
+
+    Rows are decoded from the binary file as they are iterated, so memory
+    stays flat whatever the upload size. Each item is (line, vocab, error)
+    with exactly one of vocab/error set. Lines that are not valid UTF-8 are
+    decoded with replacement characters and their rows reported as errors.
+    """
+
+    def __init__(self, fileobj: BinaryIO, fmt: str):
+        self.fmt = fmt
+        self._bad_lines = set()
+        self._text = self._decode_lines(fileobj)
+        self._csv = csv.DictReader(self._text) if fmt == "csv" else None
+
+    def _decode_lines(self, fileobj: BinaryIO) -> Iterator[str]:
+        for line_num, raw in enumerate(fileobj, start=1):
+            if line_num == 1 and raw.startswith(codecs.BOM_UTF8):
+                raw = raw[len(codecs.BOM_UTF8):]
+            try:
+                yield raw.decode("utf-8")
+            except UnicodeDecodeError:
+                self._bad_lines.add(line_num)
+                yield raw.decode("utf-8", errors="replace")
+
+    def missing_columns(self) -> list[str]:
+        if self._csv is None:
+            return []
+        return [] if "word" in (self._csv.fieldnames or []) else ["word"]
+
+    def _records(self) -> Iterator[tuple[int, object]]:
+        if self._csv is not None:
+            # A quoted field can span several lines, check all of them.
+            first_line = self._csv.line_num + 1
+            for row in self._csv:
+                if self._bad_lines.intersection(range(first_line, self._csv.line_num + 1)):
+                    yield self._csv.line_num, UnicodeError()
+                else:
+                    yield self._csv.line_num, {k: (v or None) for k, v in row.items() if k in VOCAB_IMPORT_FIELDS}
+                first_line = self._csv.line_num + 1
+            return
+        for line_num, line in enumerate(self._text, start=1):
+            if not line.strip():
+                continue
+            if line_num in self._bad_lines:
+                yield line_num, UnicodeError()
+                continue
+            try:
+                yield line_num, json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_num, e
+
+    def __iter__(self):
+        for line_num, record in self._records():
+            if isinstance(record, UnicodeError):
+                yield line_num, None, "invalid UTF-8"
+                continue
+            if isinstance(record, Exception):
+                yield line_num, None, f"invalid JSON: {record.msg}"
+                continue
+            try:
+                yield line_num, VocabCreate.model_validate(record), None
+            except ValidationError as e:
+                yield line_num, None, "; ".join(f"{'.'.join(map(str, err['loc'])) or 'row'}: {err['msg']}" for err in e.errors())
+
+
+def take(rows: Iterator, n: int) -> list:
+    """Next n items of an iterator, empty once it is exhausted"""
+    return list(islice(rows, n))
+
+
+def vocab_jsonl_chunk(vocabs) -> str:
+    """JSONL text for a batch of vocabs, one Vocab object per line"""
+    return "".join(Vocab.model_validate(vocab).model_dump_json() + "\n" for vocab in vocabs)
+
+
+def vocab_csv_chunk(vocabs, header: bool = False) -> str:
+    """CSV text for a batch of vocabs, columns in Vocab field order"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    if header:
+        writer.writerow(VOCAB_CSV_COLUMNS)
+    for vocab in vocabs:
+        row = Vocab.model_validate(vocab).model_dump(mode="json")
+        writer.writerow([row[column] for column in VOCAB_CSV_COLUMNS])
+    return buffer.getvalue()
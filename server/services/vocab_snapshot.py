@@ -0,0 +1,72 @@
+import os
+import gzip
+import threading
+from typing import Callable, Optional
+
+VOCAB_SNAPSHOT_GZIP_LEVEL = int(os.getenv("VOCAB_SNAPSHOT_GZIP_LEVEL", "6"))
+
+
+def compress(body: bytes) -> bytes:
+    """Deterministic gzip of a body, so equal bodies give equal bytes"""
+    return gzip.compress(body, compresslevel=VOCAB_SNAPSHOT_GZIP_LEVEL, mtime=0)
+
+
+class VocabSnapshot:
+    """Serialized JSON bodies of vocab list responses, one per dataset version.
+
+    Slices are keyed by word_type (None is the full list), callers only
+    cache types that exist. All of them are dropped as soon as a different
+    version is requested, so a snapshot is
+    never served after a write. The gzip variant is compressed on first use.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._bodies = {}
+        self._gzipped = {}
+        self.builds = 0
+
+    def clear(self):
+        with self._lock:
+            self._version = None
+            self._bodies = {}
+            self._gzipped = {}
+            self.builds = 0
+
+    def _lookup(self, version: str, key: Optional[str]) -> Optional[bytes]:
+        with self._lock:
+            if self._version != version:
+                self._version = version
+                self._bodies = {}
+                self._gzipped = {}
+            return self._bodies.get(key)
+
+    def cached(self, version: str, key: Optional[str], compressed: bool = False) -> Optional[bytes]:
+        """Bytes ready to serve for key, None when they still have to be built or compressed"""
+        with self._lock:
+            if self._version != version:
+                return None
+            return (self._gzipped if compressed else self._bodies).get(key)
+
+    def get(self, version: str, key: Optional[str], build: Callable[[], bytes], compressed: bool = False) -> bytes:
+        body = self._lookup(version, key)
+        if body is None:
+            body = build()
+            with self._lock:
+                self.builds += 1
+                if self._version == version:
+                    self._bodies[key] = body
+        if not compressed:
+            return body
+        with self._lock:
+            packed = self._gzipped.get(key)
+        if packed is None:
+            packed = compress(body)
+            with self._lock:
+                if self._version == version and key in self._bodies:
+                    self._gzipped[key] = packed
+        return packed
+
+
+vocab_snapshot = VocabSnapshot()
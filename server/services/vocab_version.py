@@ -0,0 +1,33 @@
+import secrets
+import threading
+
+
+class DatasetVersion:
+    """Monotonic version of the vocabulary, bumped after every committed write.
+
+    The boot id keeps ETags from different processes or restarts apart, so a
+    client never gets a 304 for data it has not seen. The counter only sees
+    writes of this process, which is why the server runs a single worker.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.boot_id = secrets.token_hex(4)
+        self.value = 0
+
+    def bump(self):
+        with self._lock:
+            self.value += 1
+            return self.value
+
+    def reset(self):
+        with self._lock:
+            self.boot_id = secrets.token_hex(4)
+            self.value = 0
+
+    def etag(self) -> str:
+        with self._lock:
+            return f'"{self.boot_id}-{self.value}"'
+
+
+vocab_version = DatasetVersion()
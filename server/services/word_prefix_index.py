@@ -0,0 +1,94 @@
+from bisect import bisect_left, insort
+from sqlalchemy.orm import Session
+from models.vocab import EnglishVocab
+from services.lazy_index import LazyIndex
+
+# Inserts collect in a small sorted buffer that is folded into the main list
+# once it holds this many words, so large imports pay for a full list copy
+# only every few thousand words instead of on every chunk.
+RECENT_BUFFER_SIZE = 16384
+
+
+def normalize_word(word: str) -> str:
+    return word.strip().casefold()
+
+
+def merge_entries(entries: list, new: list) -> list:
+    """Merge sorted new entries into sorted entries, skipping ones already present.
+
+    Each new entry is located with bisect and the runs between them are
+    copied as slices, so a batch costs one list copy instead of a re-sort.
+    """
+    merged = []
+    start = 0
+    for entry in new:
+        i = bisect_left(entries, entry, start)
+        merged.extend(entries[start:i])
+        start = i
+        if i == len(entries) or entries[i] != entry:
+            merged.append(entry)
+    merged.extend(entries[start:])
+    return merged
+
+
+class WordPrefixIndex(LazyIndex):
+    """Sorted, case-folded copy of every vocab word for prefix lookups.
+
+    Seeded from english_vocabs on first use and extended by vocab_crud when
+    words are inserted, so autocomplete never has to query SQLite. New words
+    go to a short sorted buffer first, lookups read both lists.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._entries = []
+        self._recent = []
+
+    def _fetch(self, db: Session):
+        return sorted((normalize_word(word), word) for (word,) in db.query(EnglishVocab.word))
+
+    def _install(self, entries: list, pending: list):
+        self._entries = merge_entries(entries, sorted(pending)) if pending else entries
+        self._recent = []
+
+    def _reset(self):
+        self._entries = []
+        self._recent = []
+
+    def add_many(self, words: list[str]):
+        with self._lock:
+            entries = [(normalize_word(word), word) for word in words]
+            self._record(*entries)
+            if not self.loaded:
+                return
+            if len(entries) > 32:
+                self._recent = merge_entries(self._recent, sorted(entries))
+            else:
+                for entry in entries:
+                    insort(self._recent, entry)
+            if len(self._recent) >= RECENT_BUFFER_SIZE:
+                self._entries = merge_entries(self._entries, self._recent)
+                self._recent = []
+
+    @staticmethod
+    def _matches(entries: list, key: str, limit: int) -> list:
+        found = []
+        i = bisect_left(entries, (key,))
+        while i < len(entries) and len(found) < limit and entries[i][0].startswith(key):
+            found.append(entries[i])
+            i += 1
+        return found
+
+    def complete(self, prefix: str, limit: int = 10) -> list[str]:
+        key = normalize_word(prefix)
+        with self._lock:
+            found = self._matches(self._entries, key, limit)
+            if self._recent:
+                found = sorted(found + self._matches(self._recent, key, limit))[:limit]
+            return [word for _, word in found]
+
+    def __len__(self):
+        return len(self._entries) + len(self._recent)
+
+
+word_prefix_index = WordPrefixIndex()
@@ -0,0 +1,88 @@
+import random
+from array import array
+from typing import Optional
+from sqlalchemy.orm import Session
+from models.vocab import EnglishVocab
+from services.lazy_index import LazyIndex
+
+
+def _apply_moves(ids: dict, moves) -> None:
+    """Apply (id, old_type, new_type) changes to ids in place.
+
+    Every touched array is rebuilt once per batch instead of being scanned
+    once per id, and the result does not depend on whether a moved id was
+    already in its new array, so replaying a move is harmless.
+    """
+    final = {vocab_id: new_type for vocab_id, _, new_type in moves}
+    touched = {word_type for _, old_type, new_type in moves for word_type in (old_type, new_type)}
+    for word_type in touched:
+        if word_type in ids:
+            ids[word_type] = array("q", (i for i in ids[word_type] if i not in final))
+    for vocab_id, word_type in final.items():
+        ids.setdefault(word_type, array("q")).append(vocab_id)
+    for word_type in touched:
+        if not ids.get(word_type, True):
+            del ids[word_type]
+
+
+class WordTypeIndex(LazyIndex):
+    """Vocab ids grouped by word_type, kept as compact int64 arrays.
+
+    Seeded from english_vocabs on first use and kept current by vocab_crud on
+    create, bulk create and word_type changes. Besides random sampling it is
+    the word_type catalog, the array lengths are the live per-type counts.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._ids = {}
+
+    def _fetch(self, db: Session):
+        ids = {}
+        for vocab_id, word_type in db.query(EnglishVocab.id, EnglishVocab.word_type).order_by(EnglishVocab.id):
+            ids.setdefault(word_type, array("q")).append(vocab_id)
+        return ids
+
+    def _install(self, ids: dict, pending: list):
+        # Inserts were recorded as moves from None, see add.
+        _apply_moves(ids, pending)
+        self._ids = ids
+
+    def _reset(self):
+        self._ids = {}
+
+    def add(self, vocab_id: int, word_type: Optional[str]):
+        with self._lock:
+            self._record((vocab_id, None, word_type))
+            if self.loaded:
+                self._ids.setdefault(word_type, array("q")).append(vocab_id)
+
+    def move_many(self, moves):
+        """Apply a batch of (id, old_type, new_type) word_type changes"""
+        moves = [move for move in moves if move[1] != move[2]]
+        if not moves:
+            return
+        with self._lock:
+            self._record(*moves)
+            if self.loaded:
+                _apply_moves(self._ids, moves)
+
+    def sample(self, word_type: str, k: int) -> list[int]:
+        """k distinct ids of the given type, picked uniformly without replacement"""
+        with self._lock:
+            ids = self._ids.get(word_type)
+            if not ids:
+                return []
+            return [ids[i] for i in random.sample(range(len(ids)), min(k, len(ids)))]
+
+    def count(self, word_type: str) -> int:
+        with self._lock:
+            return len(self._ids.get(word_type, ()))
+
+    def counts(self) -> dict[str, int]:
+        """Count per word_type, untyped vocabs excluded, ordered by type"""
+        with self._lock:
+            return {word_type: len(self._ids[word_type]) for word_type in sorted(t for t in self._ids if t is not None)}
+
+
+word_type_index = WordTypeIndex()
@@ -0,0 +1,75 @@
+import gzip
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from schemas.vocab import VocabCreate, VocabUpdate
+from schemas.scores import ScoreCreate
+from crud import async_vocab_crud, async_score_crud
+from services.vocab_snapshot import vocab_snapshot
+
+
+class TestAsyncVocabCrud:
+    """Test the async vocab CRUD layer"""
+    
+    async def test_create_and_read_vocab(self, test_async_db_session: AsyncSession):
+        """Test creating and reading vocabs through an AsyncSession"""
+        created = await async_vocab_crud.create_vocab(test_async_db_session, VocabCreate(word="ardent", word_type="adjective"))
+        
+        found = await async_vocab_crud.get_vocab_by_word(test_async_db_session, "ardent")
+        
+        assert found.id == created.id
+        assert await async_vocab_crud.count_vocab(test_async_db_session) == 1
+        assert (await async_vocab_crud.get_vocab_by_count(test_async_db_session, "adjective")).count == 1
+    
+    async def test_update_vocab(self, test_async_db_session: AsyncSession):
+        """Test updating a vocab through an AsyncSession"""
+        created = await async_vocab_crud.create_vocab(test_async_db_session, VocabCreate(word="ardent"))
+        
+        updated = await async_vocab_crud.update_vocab(test_async_db_session, created, VocabUpdate(meaning="passionate"))
+        
+        assert updated.meaning == "passionate"
+        assert updated.updated_at is not None
+    
+    async def test_iter_vocab_batches(self, test_async_db_session: AsyncSession):
+        """Test streaming vocabs in batches through an AsyncSession"""
+        await async_vocab_crud.bulk_create_vocab(test_async_db_session, [VocabCreate(word=f"word{i}") for i in range(5)])
+        
+        batches = [batch async for batch in async_vocab_crud.iter_vocab_batches(test_async_db_session, batch_size=2)]
+        
+        assert [len(batch) for batch in batches] == [2, 2, 1]
+        assert batches[0][0].word == "word0"
+    
+    async def test_snapshot_encoded_off_the_session(self, test_async_db_session: AsyncSession):
+        """Test the snapshot built from fetched rows matches the JSON body and is reused"""
+        await async_vocab_crud.bulk_create_vocab(test_async_db_session, [VocabCreate(word="run", word_type="verb"), VocabCreate(word="cat")])
+        
+        body = await async_vocab_crud.get_vocab_snapshot(test_async_db_session)
+        packed = await async_vocab_crud.get_vocab_snapshot(test_async_db_session, compressed=True)
+        
+        assert body == await async_vocab_crud.get_vocab_json(test_async_db_session)
+        assert gzip.decompress(packed) == body
+        assert await async_vocab_crud.get_vocab_snapshot(test_async_db_session) is body
+        assert vocab_snapshot.builds == 1
+
+
+class TestAsyncScoreCrud:
+    """Test the async score CRUD layer"""
+    
+    async def test_create_and_rank_scores(self, test_async_db_session: AsyncSession):
+        """Test score inserts and leaderboard reads through an AsyncSession"""
+        await async_score_crud.create_score(test_async_db_session, ScoreCreate(high_score=10, high_scorer="A"))
+        await async_score_crud.create_score(test_async_db_session, ScoreCreate(high_score=30, high_scorer="B"))
+        
+        high = await async_score_crud.get_high_score(test_async_db_session)
+        
+        assert high.high_scorer == "B"
+        assert await async_score_crud.count_scores(test_async_db_session) == 2
+    
+    async def test_delete_score_by_username(self, test_async_db_session: AsyncSession):
+        """Test deleting scores through an AsyncSession"""
+        await async_score_crud.create_score(test_async_db_session, ScoreCreate(high_score=10, high_scorer="Gone"))
+        
+        deleted = await async_score_crud.delete_score_by_username(test_async_db_session, "gone")
+        
+        assert deleted == 1
+        assert await async_score_crud.get_high_score(test_async_db_session) is None
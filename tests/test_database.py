@@ -0,0 +1,56 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from database.database import apply_sqlite_profile, to_async_url, SQLITE_BUSY_TIMEOUT_MS
+
+
+class TestEngineProfile:
+    """Test the SQLite engine profile and the read/write split"""
+    
+    def test_writer_profile_pragmas(self, tmp_path):
+        """Test that writer connections run in WAL mode with the configured pragmas"""
+        engine = apply_sqlite_profile(create_engine(f"sqlite:///{tmp_path / 'profile.db'}"))
+        
+        with engine.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert conn.execute(text("PRAGMA synchronous")).scalar() == 1
+            assert conn.execute(text("PRAGMA busy_timeout")).scalar() == SQLITE_BUSY_TIMEOUT_MS
+        engine.dispose()
+    
+    def test_read_only_connections_reject_writes(self, tmp_path):
+        """Test that read pool connections cannot modify the database"""
+        url = f"sqlite:///{tmp_path / 'profile.db'}"
+        writer = apply_sqlite_profile(create_engine(url))
+        with writer.begin() as conn:
+            conn.execute(text("CREATE TABLE words (word TEXT)"))
+        reader = apply_sqlite_profile(create_engine(url), read_only=True)
+        
+        with reader.connect() as conn:
+            assert conn.execute(text("SELECT count(*) FROM words")).scalar() == 0
+            with pytest.raises(OperationalError):
+                conn.execute(text("INSERT INTO words VALUES ('ardent')"))
+        writer.dispose()
+        reader.dispose()
+    
+    async def test_async_engine_profile(self, tmp_path):
+        """Test that the profile is applied to aiosqlite connections too"""
+        engine = apply_sqlite_profile(create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'profile.db'}"))
+        
+        async with engine.connect() as conn:
+            assert (await conn.execute(text("PRAGMA journal_mode"))).scalar() == "wal"
+        await engine.dispose()
+    
+    def test_to_async_url(self):
+        """Test deriving the async URL from the configured database URL"""
+        assert to_async_url("sqlite:///./database/english_vocab.db") == "sqlite+aiosqlite:///./database/english_vocab.db"
+        assert to_async_url("postgresql+asyncpg://u:p@host/db") == "postgresql+asyncpg://u:p@host/db"
+    
+    def test_read_routes_use_read_only_sessions(self, test_client, test_db_session):
+        """Test that GET routes work on the read-only session while writes use the writer"""
+        assert test_client.post("/vocabs/create", json={"word": "ardent"}).status_code == 200
+        assert test_client.post("/scores/insert_score", json={"high_score": 5, "high_scorer": "A"}).status_code == 200
+        
+        assert len(test_client.get("/vocabs/read").json()) == 1
+        assert test_client.get("/scores/high_score").json()["high_score"] == 5
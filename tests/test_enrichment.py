@@ -0,0 +1,133 @@
+import json
+import pytest
+from sqlalchemy.orm import Session
+
+from crud.vocab_crud import create_vocab, get_vocab_by_word, fill_missing_fields
+from schemas.vocab import VocabCreate
+from schemas.llm_client import ClientResponse
+from services import enrichment
+from services.enrichment import enrich_batch, get_checkpoint, parse_enrichment_answer
+
+
+def fake_llm(answers: dict, calls: list):
+    async def ask(prompt: str, instruction: str):
+        words = [item["word"] for item in json.loads(prompt)]
+        calls.append(words)
+        found = {w: answers[w] for w in words if w in answers}
+        return ClientResponse(status_code=200, details=f"```json\n{json.dumps(found)}\n```")
+    return ask
+
+
+class TestEnrichment:
+    """Test the background enrichment of missing meanings and examples"""
+    
+    async def test_enrich_batch_fills_only_missing_fields(self, test_db_session: Session):
+        """Test that a batch fills NULL fields and keeps existing ones"""
+        create_vocab(test_db_session, VocabCreate(word="ardent", meaning="passionate"))
+        create_vocab(test_db_session, VocabCreate(word="candid"))
+        create_vocab(test_db_session, VocabCreate(word="done", meaning="finished", example="It is done."))
+        calls = []
+        ask = fake_llm({
+            "ardent": {"meaning": "overwritten?", "example": "An ardent fan."},
+            "candid": {"meaning": "frank", "example": "A candid reply."},
+        }, calls)
+        
+        report = await enrich_batch(test_db_session, ask=ask)
+        
+        assert calls == [["ardent", "candid"]]
+        assert report["scanned"] == 2
+        assert report["updated"] == 2
+        test_db_session.expire_all()
+        ardent = get_vocab_by_word(test_db_session, "ardent")
+        assert ardent.meaning == "passionate"
+        assert ardent.example == "An ardent fan."
+        assert get_vocab_by_word(test_db_session, "candid").meaning == "frank"
+    
+    async def test_enrich_batch_checkpoints_progress(self, test_db_session: Session):
+        """Test that batches resume after the checkpoint and wrap around when done"""
+        for word in ["one", "two", "three"]:
+            create_vocab(test_db_session, VocabCreate(word=word))
+        calls = []
+        ask = fake_llm({}, calls)
+        
+        await enrich_batch(test_db_session, ask=ask, batch_size=2)
+        await enrich_batch(test_db_session, ask=ask, batch_size=2)
+        assert calls == [["one", "two"], ["three"]]
+        assert get_checkpoint(test_db_session) == get_vocab_by_word(test_db_session, "three").id
+        
+        assert await enrich_batch(test_db_session, ask=ask, batch_size=2) is None
+        assert get_checkpoint(test_db_session) == 0
+    
+    async def test_enrich_batch_does_not_advance_on_failure(self, test_db_session: Session):
+        """Test that a failed LLM call leaves the checkpoint untouched"""
+        create_vocab(test_db_session, VocabCreate(word="ardent"))
+        
+        async def failing(prompt: str, instruction: str):
+            return ClientResponse(status_code=500, details="[Sarvam Error] boom")
+        
+        with pytest.raises(RuntimeError):
+            await enrich_batch(test_db_session, ask=failing)
+        assert get_checkpoint(test_db_session) == 0
+    
+    async def test_enrich_batch_skips_batch_after_max_attempts(self, test_db_session: Session):
+        """Test that a batch with unparseable answers is skipped once the attempts run out"""
+        create_vocab(test_db_session, VocabCreate(word="ardent"))
+        calls = []
+        
+        async def chatty(prompt: str, instruction: str):
+            calls.append(prompt)
+            return ClientResponse(status_code=200, details="Sorry, I cannot help with that.")
+        
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                await enrich_batch(test_db_session, ask=chatty, max_attempts=3)
+            assert get_checkpoint(test_db_session) == 0
+        
+        report = await enrich_batch(test_db_session, ask=chatty, max_attempts=3)
+        
+        assert report["skipped"] is True
+        assert len(calls) == 3
+        assert get_checkpoint(test_db_session) == get_vocab_by_word(test_db_session, "ardent").id
+    
+    def test_fill_missing_fields_uses_coalesce(self, test_db_session: Session):
+        """Test that filling never overwrites a value set in the meantime"""
+        vocab = create_vocab(test_db_session, VocabCreate(word="ardent", meaning="editor value"))
+        
+        fill_missing_fields(test_db_session, [{"id": vocab.id, "meaning": "llm value", "example": "llm example"}])
+        test_db_session.refresh(vocab)
+        
+        assert vocab.meaning == "editor value"
+        assert vocab.example == "llm example"
+    
+    async def test_enrich_batch_drops_non_string_values(self, test_db_session: Session):
+        """Test list or object meanings are dropped instead of failing the write"""
+        create_vocab(test_db_session, VocabCreate(word="ardent"))
+        ask = fake_llm({"ardent": {"meaning": ["passionate", "eager"], "example": "An ardent fan."}}, [])
+        
+        report = await enrich_batch(test_db_session, ask=ask)
+        
+        assert report["updated"] == 1
+        test_db_session.expire_all()
+        ardent = get_vocab_by_word(test_db_session, "ardent")
+        assert (ardent.meaning, ardent.example) == (None, "An ardent fan.")
+    
+    async def test_enrich_batch_counts_write_failures(self, test_db_session: Session, monkeypatch):
+        """Test a batch whose write keeps failing is skipped after max_attempts"""
+        create_vocab(test_db_session, VocabCreate(word="ardent"))
+        ask = fake_llm({"ardent": {"meaning": "passionate"}}, [])
+        
+        def broken_fill(db, fills):
+            raise RuntimeError("write failed")
+        
+        monkeypatch.setattr(enrichment.vocab_crud, "fill_missing_fields", broken_fill)
+        with pytest.raises(RuntimeError):
+            await enrich_batch(test_db_session, ask=ask, max_attempts=2)
+        report = await enrich_batch(test_db_session, ask=ask, max_attempts=2)
+        
+        assert report["skipped"] is True
+        assert get_checkpoint(test_db_session) == get_vocab_by_word(test_db_session, "ardent").id
+    
+    def test_parse_enrichment_answer_rejects_non_json(self):
+        """Test that answers without a JSON object are rejected"""
+        with pytest.raises(ValueError):
+            parse_enrichment_answer("Sorry, I cannot help with that.")
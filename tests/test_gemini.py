@@ -56,3 +56,27 @@ def test_ask_gemini_handles_unknown_exception(monkeypatch):
 
     assert response.status_code == 500
     assert "[Gemini Error]" in response.details
+
+
+async def test_ask_gemini_async_returns_success(monkeypatch):
+    async def fake_generate_content(*, model, config, contents):
+        return DummyContent()
+
+    monkeypatch.setattr(gemini.get_async_client().models, "generate_content", fake_generate_content)
+
+    response = await gemini.ask_gemini_async("prompt", "instruction")
+
+    assert response.status_code == 200
+    assert response.details == DummyContent.text
+
+
+async def test_ask_gemini_async_handles_unknown_exception(monkeypatch):
+    async def raise_value_error(*, model, config, contents):
+        raise ValueError("boom")
+
+    monkeypatch.setattr(gemini.get_async_client().models, "generate_content", raise_value_error)
+
+    response = await gemini.ask_gemini_async("prompt", "instruction")
+
+    assert response.status_code == 500
+    assert "[Gemini Error]" in response.details
@@ -0,0 +1,274 @@
+import json
+import asyncio
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+
+from routers import llm_router
+from schemas.llm_client import ClientResponse
+from services.answer_cache import answer_cache
+
+
+@pytest.fixture
+def sarvam_calls(monkeypatch):
+    calls = []
+
+    async def fake_ask_sarvam(prompt: str, instruction: str):
+        calls.append((prompt, instruction))
+        return ClientResponse(status_code=200, details=f"answer {len(calls)}")
+
+    monkeypatch.setattr(llm_router, "ask_sarvam_async", fake_ask_sarvam)
+    return calls
+
+
+def parse_sse(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        event, data = block.split("\n")
+        events.append((event.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+    return events
+
+
+class TestAnswerCache:
+    """Test the two tier LLM answer cache"""
+    
+    def test_get_answers_served_from_cache(self, test_client: TestClient, sarvam_calls):
+        """Test that a repeated prompt does not reach the provider"""
+        payload = {"prompt": "synonyms of", "word": "ardent"}
+        
+        first = test_client.post("/ai/get_answers", json=payload)
+        second = test_client.post("/ai/get_answers", json={"prompt": "Synonyms  of", "word": "ardent "})
+        
+        assert first.status_code == 200
+        assert second.json()["answer"] == first.json()["answer"] == "answer 1"
+        assert len(sarvam_calls) == 1
+        stats = test_client.get("/ai/cache_stats").json()
+        assert stats["memory_hits"] == 1
+        assert stats["misses"] == 1
+    
+    def test_get_answers_bypass_cache(self, test_client: TestClient, sarvam_calls):
+        """Test that bypass_cache always calls the provider and refreshes the entry"""
+        payload = {"prompt": "antonyms of", "word": "ardent"}
+        
+        test_client.post("/ai/get_answers", json=payload)
+        response = test_client.post("/ai/get_answers", params={"bypass_cache": True}, json=payload)
+        
+        assert response.json()["answer"] == "answer 2"
+        assert len(sarvam_calls) == 2
+        assert test_client.post("/ai/get_answers", json=payload).json()["answer"] == "answer 2"
+    
+    def test_provider_errors_are_not_cached(self, test_client: TestClient, monkeypatch):
+        """Test that a failed provider call surfaces its status and stores nothing"""
+        async def rate_limited(prompt: str, instruction: str):
+            return ClientResponse(status_code=429, details="slow down")
+        
+        monkeypatch.setattr(llm_router, "ask_sarvam_async", rate_limited)
+        
+        response = test_client.post("/ai/get_answers", json={"prompt": "meaning of", "word": "ardent"})
+        
+        assert response.status_code == 429
+        assert answer_cache.get("meaning of\nardent", llm_router.DEFAULT_INSTRUCTION) is None
+    
+    def test_cache_survives_restart(self):
+        """Test that entries are served from the SQLite tier after the memory tier is gone"""
+        answer_cache.set("meaning of ardent", "instruction", "passionate")
+        answer_cache._entries.clear()
+        
+        assert answer_cache.get("meaning of ardent", "instruction") == "passionate"
+        assert answer_cache.stats()["disk_hits"] == 1
+    
+    def test_expired_entries_are_misses(self):
+        """Test that entries past their TTL are not returned"""
+        answer_cache.ttl = -1
+        answer_cache.set("meaning of ardent", "instruction", "passionate")
+        
+        assert answer_cache.get("meaning of ardent", "instruction") is None
+        assert answer_cache.purge_expired() == 1
+    
+    def test_disk_tier_is_capped(self):
+        """Test that periodic purges keep only the newest rows on disk"""
+        answer_cache.max_disk_entries = 2
+        answer_cache.purge_every = 4
+        for word in ["one", "two", "three", "four"]:
+            answer_cache.set(word, "instruction", word)
+        answer_cache._entries.clear()
+        
+        assert answer_cache.get("one", "instruction") is None
+        assert answer_cache.get("two", "instruction") is None
+        assert answer_cache.get("four", "instruction") == "four"
+    
+    def test_lru_eviction(self):
+        """Test that the memory tier keeps only the most recently used entries"""
+        answer_cache.max_entries = 2
+        for word in ["one", "two", "three"]:
+            answer_cache.set(word, "instruction", word)
+        
+        assert len(answer_cache._entries) == 2
+        assert answer_cache.get("one", "instruction") == "one"
+        assert answer_cache.stats()["disk_hits"] == 1
+
+
+class TestStreamAnswers:
+    """Test the SSE variant of /ai/get_answers"""
+    
+    def test_stream_relays_deltas_then_done(self, test_client: TestClient, monkeypatch):
+        """Test that provider chunks are relayed in order and the full answer is cached"""
+        async def fake_stream(prompt: str, instruction: str):
+            for text in ["eager, ", "fervent"]:
+                yield text
+        
+        monkeypatch.setattr(llm_router, "stream_sarvam", fake_stream)
+        payload = {"prompt": "synonyms of", "word": "ardent"}
+        
+        response = test_client.post("/ai/get_answers/stream", json=payload)
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert parse_sse(response.text) == [
+            ("delta", {"text": "eager, "}),
+            ("delta", {"text": "fervent"}),
+            ("done", {"received_prompt": "synonyms of\nardent", "answer": "eager, fervent"}),
+        ]
+        assert answer_cache.get("synonyms of\nardent", llm_router.DEFAULT_INSTRUCTION) == "eager, fervent"
+    
+    def test_stream_empty_answer_not_cached(self, test_client: TestClient, monkeypatch):
+        """Test that a stream that ends without text is not cached"""
+        async def empty_stream(prompt: str, instruction: str):
+            return
+            yield
+        
+        monkeypatch.setattr(llm_router, "stream_sarvam", empty_stream)
+        payload = {"prompt": "synonyms of", "word": "ardent"}
+        
+        events = parse_sse(test_client.post("/ai/get_answers/stream", json=payload).text)
+        
+        assert events == [("done", {"received_prompt": "synonyms of\nardent", "answer": ""})]
+        assert answer_cache.get("synonyms of\nardent", llm_router.DEFAULT_INSTRUCTION) is None
+    
+    def test_stream_served_from_cache(self, test_client: TestClient, sarvam_calls):
+        """Test that a cached answer is sent as a single delta"""
+        payload = {"prompt": "synonyms of", "word": "ardent"}
+        test_client.post("/ai/get_answers", json=payload)
+        
+        events = parse_sse(test_client.post("/ai/get_answers/stream", json=payload).text)
+        
+        assert events[0] == ("delta", {"text": "answer 1"})
+        assert events[-1][0] == "done"
+        assert len(sarvam_calls) == 1
+    
+    def test_stream_reports_provider_error(self, test_client: TestClient, monkeypatch):
+        """Test that a failing provider ends the stream with an error event"""
+        async def broken_stream(prompt: str, instruction: str):
+            yield "partial"
+            raise RuntimeError("connection reset")
+        
+        monkeypatch.setattr(llm_router, "stream_sarvam", broken_stream)
+        
+        events = parse_sse(test_client.post("/ai/get_answers/stream", json={"prompt": "meaning of ardent"}).text)
+        
+        assert events[-1][0] == "error"
+        assert "connection reset" in events[-1][1]["detail"]
+        assert answer_cache.get("meaning of ardent", llm_router.DEFAULT_INSTRUCTION) is None
+
+
+class TestRequestCoalescing:
+    """Test that identical in-flight prompts share one provider call"""
+    
+    async def test_identical_prompts_share_one_call(self, monkeypatch):
+        """Test that a burst of identical requests reaches the provider once"""
+        calls = []
+        
+        async def slow_sarvam(prompt: str, instruction: str):
+            calls.append(prompt)
+            await asyncio.sleep(0.05)
+            return ClientResponse(status_code=200, details="fervent")
+        
+        monkeypatch.setattr(llm_router, "ask_sarvam_async", slow_sarvam)
+        payload = {"prompt": "synonyms of", "word": "ardent"}
+        
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            responses = await asyncio.gather(*(client.post("/ai/get_answers", json=payload) for _ in range(10)))
+        
+        assert [r.json()["answer"] for r in responses] == ["fervent"] * 10
+        assert len(calls) == 1
+    
+    async def test_errors_propagate_to_all_waiters(self, monkeypatch):
+        """Test that every coalesced request sees the provider error"""
+        calls = []
+        
+        async def failing_sarvam(prompt: str, instruction: str):
+            calls.append(prompt)
+            await asyncio.sleep(0.05)
+            return ClientResponse(status_code=503, details="unavailable")
+        
+        monkeypatch.setattr(llm_router, "ask_sarvam_async", failing_sarvam)
+        
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            responses = await asyncio.gather(*(client.post("/ai/get_answers", json={"prompt": "meaning of ardent"}) for _ in range(5)))
+        
+        assert [r.status_code for r in responses] == [503] * 5
+        assert len(calls) == 1
+
+
+class TestBatchAnswers:
+    """Test /ai/get_answers/batch fan-out"""
+    
+    @pytest.fixture
+    def slow_sarvam(self, monkeypatch):
+        state = {"in_flight": 0, "peak": 0}
+        
+        async def fake(prompt: str, instruction: str):
+            state["in_flight"] += 1
+            state["peak"] = max(state["peak"], state["in_flight"])
+            word = prompt.split("\n")[-1]
+            await asyncio.sleep(0.2 if word == "slow" else 0.01)
+            state["in_flight"] -= 1
+            if word == "broken":
+                return ClientResponse(status_code=502, details="bad gateway")
+            return ClientResponse(status_code=200, details=f"meaning of {word}")
+        
+        monkeypatch.setattr(llm_router, "ask_sarvam_async", fake)
+        return state
+    
+    def test_batch_returns_results_in_order(self, test_client: TestClient, slow_sarvam):
+        """Test that results keep request order and carry per item status"""
+        words = ["ardent", "broken", "candid", "dour"]
+        payload = [{"prompt": "meaning of", "word": w} for w in words]
+        
+        response = test_client.post("/ai/get_answers/batch", params={"concurrency": 2}, json=payload)
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert [item["index"] for item in data] == [0, 1, 2, 3]
+        assert [item["status_code"] for item in data] == [200, 502, 200, 200]
+        assert data[0]["answer"] == "meaning of ardent"
+        assert data[1]["error"] == "bad gateway"
+        assert slow_sarvam["peak"] <= 2
+    
+    def test_batch_item_timeout(self, test_client: TestClient, slow_sarvam):
+        """Test that a slow item times out without failing the batch"""
+        payload = [{"prompt": "meaning of", "word": w} for w in ["slow", "quick"]]
+        
+        response = test_client.post("/ai/get_answers/batch", params={"item_timeout": 0.05}, json=payload)
+        
+        data = response.json()
+        assert data[0]["status_code"] == 504
+        assert data[1]["answer"] == "meaning of quick"
+    
+    def test_batch_stream_partial_results(self, test_client: TestClient, slow_sarvam):
+        """Test that streamed results arrive as NDJSON in completion order"""
+        payload = [{"prompt": "meaning of", "word": w} for w in ["slow", "quick"]]
+        
+        response = test_client.post("/ai/get_answers/batch", params={"stream": True}, json=payload)
+        
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [item["index"] for item in lines] == [1, 0]
+    
+    def test_batch_empty(self, test_client: TestClient):
+        """Test that an empty batch is rejected"""
+        response = test_client.post("/ai/get_answers/batch", json=[])
+        
+        assert response.status_code == 404
@@ -1,3 +1,7 @@
+import json
+import asyncio
+import threading
+import httpx
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
@@ -6,6 +10,7 @@ from schemas.vocab import VocabCreate
 from schemas.scores import ScoreCreate
 from crud.vocab_crud import create_vocab
 from crud.score_crud import create_score
+from main import app
 
 
 class TestVocabRouter:
@@ -176,6 +181,275 @@ class TestVocabRouter:
         
         assert response.status_code == 404
         assert "No vocabs found" in response.json()["detail"]
+    
+    def test_read_vocabs_keyset_pagination(self, test_client: TestClient, test_db_session: Session):
+        """Test GET /vocabs/read pages through vocabs with a next cursor"""
+        for word in ["alpha", "beta", "gamma"]:
+            create_vocab(test_db_session, VocabCreate(word=word, word_type="noun"))
+        
+        first = test_client.get("/vocabs/read", params={"limit": 2})
+        assert first.status_code == 200
+        assert [v["word"] for v in first.json()] == ["alpha", "beta"]
+        cursor = first.headers["X-Next-Cursor"]
+        
+        second = test_client.get("/vocabs/read", params={"after_id": cursor, "limit": 2})
+        assert [v["word"] for v in second.json()] == ["gamma"]
+        assert "X-Next-Cursor" not in second.headers
+    
+    def test_read_vocabs_by_type_keyset_pagination(self, test_client: TestClient, test_db_session: Session):
+        """Test GET /vocabs/read/{word_type} pages only through that type"""
+        create_vocab(test_db_session, VocabCreate(word="run", word_type="verb"))
+        create_vocab(test_db_session, VocabCreate(word="cat", word_type="noun"))
+        create_vocab(test_db_session, VocabCreate(word="jump", word_type="verb"))
+        
+        response = test_client.get("/vocabs/read/verb", params={"limit": 1})
+        assert [v["word"] for v in response.json()] == ["run"]
+        
+        response = test_client.get("/vocabs/read/verb", params={"after_id": response.headers["X-Next-Cursor"], "limit": 1})
+        assert [v["word"] for v in response.json()] == ["jump"]
+    
+    def test_read_vocabs_stream_ndjson(self, test_client: TestClient, test_db_session: Session):
+        """Test GET /vocabs/read?stream=true returns one JSON object per line"""
+        create_vocab(test_db_session, VocabCreate(word="first", word_type="noun"))
+        create_vocab(test_db_session, VocabCreate(word="second", word_type="verb"))
+        
+        response = test_client.get("/vocabs/read", params={"stream": True})
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [v["word"] for v in lines] == ["first", "second"]
+        assert "created_at" in lines[0]
+    
+    def test_vocab_stats(self, test_client: TestClient, test_db_session: Session):
+        """Test GET /vocabs/stats returns totals and per type counts"""
+        create_vocab(test_db_session, VocabCreate(word="run", word_type="verb"))
+        create_vocab(test_db_session, VocabCreate(word="jump", word_type="verb"))
+        create_vocab(test_db_session, VocabCreate(word="cat", word_type="noun"))
+        create_vocab(test_db_session, VocabCreate(word="untyped"))
+        
+        response = test_client.get("/vocabs/stats")
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total_words"] == 4
+        assert data["word_types"] == {"verb": 2, "noun": 1}
+
+    
+    def test_random_vocabs_by_type(self, test_client: TestClient, test_db_session: Session):
+        """Test GET /vocabs/random/{word_type} samples k distinct vocabs of that type"""
+        for i in range(10):
+            create_vocab(test_db_session, VocabCreate(word=f"verb{i}", word_type="verb"))
+        create_vocab(test_db_session, VocabCreate(word="cat", word_type="noun"))
+        
+        response = test_client.get("/vocabs/random/verb", params={"k": 4})
+        
+        assert response.status_code == 200
+        words = [v["word"] for v in response.json()]
+        assert len(set(words)) == 4
+        assert all(w.startswith("verb") for w in words)
+        assert test_client.get("/vocabs/random/verb", params={"k": 0}).status_code == 422
+        assert test_client.get("/vocabs/random/adverb").json() == []
+
+    
+    def test_search_vocabs(self, test_client: TestClient, test_db_session: Session):
+        """Test GET /vocabs/search returns ranked hits with snippets"""
+        create_vocab(test_db_session, VocabCreate(word="ardent", meaning="very passionate"))
+        create_vocab(test_db_session, VocabCreate(word="calm", meaning="peaceful"))
+        
+        response = test_client.get("/vocabs/search", params={"q": "passion*"})
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 1
+        assert data["results"][0]["word"] == "ardent"
+        assert data["results"][0]["snippet"] == "very <mark>passionate</mark>"
+        assert test_client.get("/vocabs/search", params={"q": "**"}).status_code == 400
+
+    
+    def test_autocomplete_vocabs(self, test_client: TestClient, test_db_session: Session):
+        """Test GET /vocabs/autocomplete returns words for a case-insensitive prefix"""
+        for word in ["Apple", "apply", "ardent", "banana"]:
+            create_vocab(test_db_session, VocabCreate(word=word))
+        
+        response = test_client.get("/vocabs/autocomplete", params={"prefix": "AP"})
+        
+        assert response.status_code == 200
+        assert response.json() == {"prefix": "AP", "words": ["Apple", "apply"]}
+        assert test_client.get("/vocabs/autocomplete", params={"prefix": "a", "limit": 1}).json()["words"] == ["Apple"]
+        assert test_client.get("/vocabs/autocomplete", params={"prefix": ""}).status_code == 422
+
+    
+    def test_vocab_reads_honor_if_none_match(self, test_client: TestClient, test_db_session: Session):
+        """Test vocab GETs return an ETag and answer 304 until the data changes"""
+        create_vocab(test_db_session, VocabCreate(word="run", word_type="verb"))
+        
+        first = test_client.get("/vocabs/read")
+        etag = first.headers["ETag"]
+        
+        for path in ["/vocabs/read", "/vocabs/read/vocab_types", "/vocabs/read/verb", "/vocabs/read/count/verb", "/vocabs/stats"]:
+            response = test_client.get(path, headers={"If-None-Match": etag})
+            assert response.status_code == 304, path
+            assert response.content == b""
+            assert response.headers["ETag"] == etag
+        
+        test_client.post("/vocabs/create", json={"word": "jump", "word_type": "verb"})
+        
+        response = test_client.get("/vocabs/read", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+        assert len(response.json()) == 2
+    
+    def test_vocab_stream_carries_etag(self, test_client: TestClient, test_db_session: Session):
+        """Test streamed reads are tagged and also honor If-None-Match"""
+        create_vocab(test_db_session, VocabCreate(word="run", word_type="verb"))
+        
+        response = test_client.get("/vocabs/read", params={"stream": True})
+        
+        assert response.headers["ETag"] == test_client.get("/vocabs/read", headers={"Accept-Encoding": "identity"}).headers["ETag"]
+        assert test_client.get("/vocabs/read/verb", params={"stream": True}, headers={"If-None-Match": f'W/{response.headers["ETag"]}'}).status_code == 304
+
+    
+    def test_read_vocabs_served_from_snapshot(self, test_client: TestClient, test_db_session: Session):
+        """Test full list reads return JSON bytes, gzipped on request, refreshed after writes"""
+        create_vocab(test_db_session, VocabCreate(word="run", word_type="verb"))
+        
+        plain = test_client.get("/vocabs/read", headers={"Accept-Encoding": "identity"})
+        packed = test_client.get("/vocabs/read/verb", headers={"Accept-Encoding": "gzip"})
+        
+        assert plain.headers["content-type"] == "application/json"
+        assert "content-encoding" not in plain.headers
+        assert packed.headers["content-encoding"] == "gzip"
+        assert packed.json() == plain.json()
+        assert packed.headers["ETag"] != plain.headers["ETag"]
+        revalidated = test_client.get("/vocabs/read", headers={"Accept-Encoding": "gzip", "If-None-Match": packed.headers["ETag"]})
+        assert (revalidated.status_code, revalidated.headers["ETag"]) == (304, packed.headers["ETag"])
+        
+        test_client.put("/vocabs/update/run", json={"meaning": "move fast"})
+        
+        assert test_client.get("/vocabs/read/verb").json()[0]["meaning"] == "move fast"
+
+    
+    def test_read_vocab_types_with_counts(self, test_client: TestClient, test_db_session: Session):
+        """Test GET /vocabs/read/vocab_types?with_counts=true returns each type with its count"""
+        create_vocab(test_db_session, VocabCreate(word="run", word_type="verb"))
+        create_vocab(test_db_session, VocabCreate(word="jump", word_type="verb"))
+        create_vocab(test_db_session, VocabCreate(word="cat", word_type="noun"))
+        create_vocab(test_db_session, VocabCreate(word="untyped"))
+        
+        plain = test_client.get("/vocabs/read/vocab_types")
+        counted = test_client.get("/vocabs/read/vocab_types", params={"with_counts": True})
+        
+        assert plain.json() == {"word_types": ["noun", "verb"]}
+        assert counted.json() == {"word_types": [{"word_type": "noun", "count": 1}, {"word_type": "verb", "count": 2}]}
+
+    
+    def test_bulk_update_vocab(self, test_client: TestClient, test_db_session: Session):
+        """Test POST /vocabs/bulk_update reports one outcome per word"""
+        create_vocab(test_db_session, VocabCreate(word="run", meaning="old"))
+        
+        response = test_client.post("/vocabs/bulk_update", json=[
+            {"word": "run", "meaning": "move fast"},
+            {"word": "ghost", "meaning": "missing"},
+        ])
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert (data["words_received"], data["words_updated"]) == (2, 1)
+        assert data["results"] == [{"word": "run", "status": "updated"}, {"word": "ghost", "status": "not_found"}]
+        assert test_client.get("/vocabs/read").json()[0]["meaning"] == "move fast"
+        assert test_client.post("/vocabs/bulk_update", json=[]).status_code == 404
+    
+    def test_upsert_vocab(self, test_client: TestClient, test_db_session: Session):
+        """Test POST /vocabs/upsert inserts new words and updates stored ones"""
+        create_vocab(test_db_session, VocabCreate(word="run", meaning="old"))
+        
+        response = test_client.post("/vocabs/upsert", json=[
+            {"word": "run", "meaning": "move fast"},
+            {"word": "jump", "word_type": "verb"},
+        ])
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert (data["words_inserted"], data["words_updated"]) == (1, 1)
+        assert [r["status"] for r in data["results"]] == ["updated", "inserted"]
+        assert {v["word"]: v["meaning"] for v in test_client.get("/vocabs/read").json()} == {"run": "move fast", "jump": None}
+
+    
+    def test_import_vocabs_csv_in_chunks(self, test_client: TestClient, test_db_session: Session):
+        """Test POST /vocabs/import commits per chunk and streams progress lines"""
+        create_vocab(test_db_session, VocabCreate(word="stored"))
+        data = "word,word_type,meaning\n" + "".join(f"word{i},noun,meaning {i}\n" for i in range(5)) + "stored,,\n,noun,\n"
+        
+        response = test_client.post(
+            "/vocabs/import",
+            params={"chunk_size": 2},
+            files={"file": ("words.csv", data.encode("utf-8"), "text/csv")},
+        )
+        
+        assert response.status_code == 200
+        events = [json.loads(line) for line in response.text.splitlines()]
+        assert [e["event"] for e in events] == ["progress"] * 4 + ["done"]
+        assert [e["rows_read"] for e in events] == [2, 4, 6, 7, 7]
+        done = events[-1]
+        assert (done["words_inserted"], done["words_skipped"], done["invalid_rows"]) == (5, 1, 1)
+        assert done["errors"][0]["line"] == 8
+        assert test_client.get("/vocabs/read/count/noun").json()["count"] == 5
+    
+    def test_import_vocabs_jsonl_upsert(self, test_client: TestClient, test_db_session: Session):
+        """Test JSONL imports with upsert update stored words"""
+        create_vocab(test_db_session, VocabCreate(word="run", meaning="old"))
+        data = '{"word": "run", "meaning": "move fast"}\n{"word": "jump"}\n'
+        
+        response = test_client.post(
+            "/vocabs/import",
+            params={"upsert": True},
+            files={"file": ("words.jsonl", data.encode("utf-8"), "application/x-ndjson")},
+        )
+        
+        done = json.loads(response.text.splitlines()[-1])
+        assert (done["event"], done["words_inserted"], done["words_updated"]) == ("done", 1, 1)
+        assert test_client.get("/vocabs/search", params={"q": "fast"}).json()["results"][0]["word"] == "run"
+    
+    def test_import_vocabs_invalid_utf8_row(self, test_client: TestClient):
+        """Test a line that is not UTF-8 is reported while the rest of its chunk is imported"""
+        data = b'{"word": "run"}\n{"word": "caf\xe9"}\n{"word": "jump"}\n'
+        
+        response = test_client.post("/vocabs/import", files={"file": ("words.jsonl", data, "application/x-ndjson")})
+        
+        done = json.loads(response.text.splitlines()[-1])
+        assert (done["event"], done["words_inserted"], done["invalid_rows"]) == ("done", 2, 1)
+        assert done["errors"] == [{"line": 2, "error": "invalid UTF-8"}]
+    
+    def test_import_vocabs_rejects_bad_uploads(self, test_client: TestClient):
+        """Test unknown formats and CSVs without a word column are refused"""
+        assert test_client.post("/vocabs/import", files={"file": ("words.txt", b"run", "text/plain")}).status_code == 400
+        assert test_client.post("/vocabs/import", files={"file": ("words.csv", b"meaning\nx\n", "text/csv")}).status_code == 400
+    
+    def test_export_vocabs_round_trip(self, test_client: TestClient, test_db_session: Session):
+        """Test GET /vocabs/export streams CSV and JSONL that import back unchanged"""
+        create_vocab(test_db_session, VocabCreate(word="run", word_type="verb", meaning="move, fast"))
+        create_vocab(test_db_session, VocabCreate(word="cat", word_type="noun"))
+        
+        exported_csv = test_client.get("/vocabs/export", params={"format": "csv"})
+        exported_jsonl = test_client.get("/vocabs/export")
+        
+        assert exported_csv.headers["content-type"].startswith("text/csv")
+        assert exported_csv.headers["content-disposition"] == 'attachment; filename="vocabs.csv"'
+        assert exported_csv.text.splitlines()[0] == "word,word_type,meaning,example,id,created_at,updated_at"
+        assert [json.loads(line)["word"] for line in exported_jsonl.text.splitlines()] == ["run", "cat"]
+        
+        test_client.post("/vocabs/upsert", json=[{"word": "run", "meaning": "changed"}])
+        response = test_client.post("/vocabs/import", params={"upsert": True}, files={"file": ("dump.csv", exported_csv.content, "text/csv")})
+        
+        assert json.loads(response.text.splitlines()[-1])["words_updated"] == 2
+        assert {v["word"]: v["meaning"] for v in test_client.get("/vocabs/read").json()} == {"run": "move, fast", "cat": None}
+    
+    def test_export_empty_csv_has_header(self, test_client: TestClient):
+        """Test an empty dictionary exports just the CSV header"""
+        response = test_client.get("/vocabs/export", params={"format": "csv"})
+        
+        assert response.text == "word,word_type,meaning,example,id,created_at,updated_at\n"
 
 
 class TestScoreRouter:
@@ -337,11 +611,120 @@ class TestScoreRouter:
         response = test_client.delete("/scores/delete_score/AnyUser")
         
         assert response.status_code == 404
+    
+    def test_score_stats(self, test_client: TestClient, test_db_session: Session):
+        """Test GET /scores/stats aggregates score totals"""
+        create_score(test_db_session, ScoreCreate(high_score=100, high_scorer="User1"))
+        create_score(test_db_session, ScoreCreate(high_score=300, high_scorer="user1"))
+        create_score(test_db_session, ScoreCreate(high_score=50, high_scorer="User2"))
+        
+        response = test_client.get("/scores/stats")
+        
+        assert response.status_code == 200
+        assert response.json() == {
+            "total_scores": 3,
+            "total_points": 450,
+            "highest_score": 300,
+            "lowest_score": 50,
+            "total_players": 2
+        }
+    
+    def test_score_stats_empty(self, test_client: TestClient, test_db_session: Session):
+        """Test GET /scores/stats on an empty table"""
+        response = test_client.get("/scores/stats")
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total_scores"] == 0
+        assert data["highest_score"] is None
+    
+    def test_get_top_scores(self, test_client: TestClient, test_db_session: Session):
+        """Test GET /scores/top returns the k highest scores"""
+        for score in [10, 30, 20, 40]:
+            create_score(test_db_session, ScoreCreate(high_score=score, high_scorer=f"User{score}"))
+        
+        response = test_client.get("/scores/top", params={"k": 2})
+        
+        assert response.status_code == 200
+        assert [s["high_score"] for s in response.json()] == [40, 30]
+    
+    def test_get_leaderboard_page(self, test_client: TestClient, test_db_session: Session):
+        """Test GET /scores/leaderboard paginates the sorted scores"""
+        for score in range(1, 6):
+            create_score(test_db_session, ScoreCreate(high_score=score, high_scorer=f"User{score}"))
+        
+        response = test_client.get("/scores/leaderboard", params={"page": 2, "page_size": 2})
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 5
+        assert data["page"] == 2
+        assert [s["high_score"] for s in data["scores"]] == [3, 2]
+
+    
+    def test_get_user_scores(self, test_client: TestClient, test_db_session: Session):
+        """Test GET /scores/user/{username} returns a user's scores best first"""
+        create_score(test_db_session, ScoreCreate(high_score=40, high_scorer="Alice"))
+        create_score(test_db_session, ScoreCreate(high_score=95, high_scorer="ALICE"))
+        create_score(test_db_session, ScoreCreate(high_score=60, high_scorer="Bob"))
+        
+        response = test_client.get("/scores/user/alice")
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["games_played"] == 2
+        assert data["best_score"]["high_score"] == 95
+        assert [s["high_score"] for s in data["scores"]] == [95, 40]
+        assert test_client.get("/scores/user/carol").status_code == 404
+    
+    def test_best_scores_per_user(self, test_client: TestClient, test_db_session: Session):
+        """Test GET /scores/best_per_user returns one entry per player"""
+        create_score(test_db_session, ScoreCreate(high_score=40, high_scorer="Alice"))
+        create_score(test_db_session, ScoreCreate(high_score=95, high_scorer="alice"))
+        create_score(test_db_session, ScoreCreate(high_score=60, high_scorer="Bob"))
+        
+        response = test_client.get("/scores/best_per_user")
+        
+        assert response.status_code == 200
+        assert [(s["high_score"], s["high_scorer"]) for s in response.json()] == [(95, "alice"), (60, "Bob")]
+
+    
+    def test_score_rank(self, test_client: TestClient, test_db_session: Session):
+        """Test GET /scores/rank and /scores/user/{username}/rank"""
+        for score, user in [(100, "A"), (80, "B"), (60, "C"), (40, "D")]:
+            create_score(test_db_session, ScoreCreate(high_score=score, high_scorer=user))
+        
+        response = test_client.get("/scores/rank", params={"score": 70})
+        
+        assert response.status_code == 200
+        assert response.json() == {"score": 70, "rank": 3, "total": 4, "percentile": 75.0}
+        assert test_client.get("/scores/user/b/rank").json()["rank"] == 2
+        assert test_client.get("/scores/user/nobody/rank").status_code == 404
+        assert test_client.get("/scores/rank").status_code == 422
 
 
 class TestCrossRouterIntegration:
     """Integration tests across vocabs and scores"""
     
+    def test_concurrent_first_reads_do_not_block_the_loop(self, test_client: TestClient, test_db_session: Session):
+        """Test concurrent requests that lazily load the in-memory indexes all complete"""
+        create_score(test_db_session, ScoreCreate(high_score=10, high_scorer="A"))
+        create_vocab(test_db_session, VocabCreate(word="apple", word_type="noun"))
+        paths = ["/scores/top", "/vocabs/random/noun", "/vocabs/autocomplete?prefix=a", "/vocabs/read/count/noun"] * 3
+        statuses = []
+        
+        async def burst():
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+                responses = await asyncio.gather(*(client.get(path) for path in paths))
+                statuses.extend(r.status_code for r in responses)
+        
+        worker = threading.Thread(target=asyncio.run, args=(burst(),), daemon=True)
+        worker.start()
+        worker.join(10)
+        
+        assert not worker.is_alive(), "event loop blocked while the indexes were loading"
+        assert statuses == [200] * len(paths)
+    
     def test_api_has_both_routers(self, test_client: TestClient):
         """Test that both routers are registered"""
         # Check vocab root
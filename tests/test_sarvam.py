@@ -0,0 +1,142 @@
+import asyncio
+from types import SimpleNamespace
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from server.llm_client import sarvam_ai, sarvam_text_speech, http_pool
+from server.schemas.llm_client import TextToSpeechReq
+
+
+def completion(content: str):
+    message = SimpleNamespace(content=content)
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+async def test_ask_sarvam_async_returns_success(monkeypatch):
+    async def fake_completions(*, messages):
+        assert messages[0]["content"] == "instruction\nprompt"
+        return completion("dummy output")
+
+    monkeypatch.setattr(sarvam_ai.get_async_client().chat, "completions", fake_completions)
+
+    response = await sarvam_ai.ask_sarvam_async("prompt", "instruction")
+
+    assert response.status_code == 200
+    assert response.details == "dummy output"
+
+
+async def test_ask_sarvam_async_handles_exception(monkeypatch):
+    async def raise_value_error(*, messages):
+        raise ValueError("boom")
+
+    monkeypatch.setattr(sarvam_ai.get_async_client().chat, "completions", raise_value_error)
+
+    response = await sarvam_ai.ask_sarvam_async("prompt", "instruction")
+
+    assert response.status_code == 500
+    assert "[Sarvam Error]" in response.details
+
+
+async def test_ask_sarvam_async_respects_concurrency_limit(monkeypatch):
+    in_flight = 0
+    peak = 0
+
+    async def slow_completions(*, messages):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return completion("ok")
+
+    monkeypatch.setattr(sarvam_ai.get_async_client().chat, "completions", slow_completions)
+    monkeypatch.setattr(sarvam_ai, "_slots", asyncio.Semaphore(3))
+
+    responses = await asyncio.gather(*(sarvam_ai.ask_sarvam_async("prompt", "instruction") for _ in range(10)))
+
+    assert all(r.status_code == 200 for r in responses)
+    assert peak == 3
+
+
+async def test_stream_sarvam_yields_deltas(monkeypatch):
+    async def chunks():
+        for content in ["ea", None, "ger"]:
+            delta = SimpleNamespace(content=content)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+    async def fake_completions(*, messages, stream):
+        assert stream is True
+        return chunks()
+
+    monkeypatch.setattr(sarvam_ai.get_async_client().chat, "completions", fake_completions)
+
+    parts = [text async for text in sarvam_ai.stream_sarvam("prompt", "instruction")]
+
+    assert parts == ["ea", "ger"]
+
+
+def test_async_client_shares_http_pool():
+    client = sarvam_ai.get_async_client()
+
+    assert sarvam_ai.get_async_client() is client
+    assert sarvam_ai._async_http is sarvam_ai.get_http_client()
+
+
+def mock_http_pool(monkeypatch, handler):
+    calls = []
+
+    def record(request):
+        calls.append(request)
+        return handler(request)
+
+    pooled = httpx.AsyncClient(transport=httpx.MockTransport(record))
+    monkeypatch.setattr(sarvam_text_speech, "get_http_client", lambda: pooled)
+    return calls
+
+
+async def test_text_to_speech_uses_shared_client(monkeypatch):
+    monkeypatch.setenv("SARVAM_TEXT_TO_SPEECH_API_URI", "https://tts.test/speak")
+    calls = mock_http_pool(monkeypatch, lambda request: httpx.Response(200, json={"request_id": "r1", "audios": ["UklGRg=="]}))
+
+    res = await sarvam_text_speech.sarvamTextToSpeech(TextToSpeechReq(text="ardent"))
+    await sarvam_text_speech.sarvamTextToSpeech(TextToSpeechReq(text="ardent"))
+
+    assert res.req_id == "r1"
+    assert res.audio == ["UklGRg=="]
+    assert len(calls) == 2
+
+
+async def test_text_to_speech_propagates_provider_error(monkeypatch):
+    monkeypatch.setenv("SARVAM_TEXT_TO_SPEECH_API_URI", "https://tts.test/speak")
+    mock_http_pool(monkeypatch, lambda request: httpx.Response(400, json={"error": "bad speaker"}))
+
+    with pytest.raises(HTTPException) as exc:
+        await sarvam_text_speech.sarvamTextToSpeech(TextToSpeechReq(text="ardent"))
+
+    assert exc.value.status_code == 400
+    assert exc.value.detail == {"error": "bad speaker"}
+
+
+@pytest.mark.parametrize("response", [
+    httpx.Response(200, text="<html>maintenance</html>"),
+    httpx.Response(200, json={"request_id": "r1"}),
+    httpx.Response(200, json=["UklGRg=="]),
+])
+async def test_text_to_speech_bad_success_body_is_bad_gateway(monkeypatch, response):
+    monkeypatch.setenv("SARVAM_TEXT_TO_SPEECH_API_URI", "https://tts.test/speak")
+    mock_http_pool(monkeypatch, lambda request: response)
+
+    with pytest.raises(HTTPException) as exc:
+        await sarvam_text_speech.sarvamTextToSpeech(TextToSpeechReq(text="ardent"))
+
+    assert exc.value.status_code == 502
+
+
+async def test_close_http_client_recreates_on_next_use():
+    first = http_pool.get_http_client()
+
+    await http_pool.close_http_client()
+
+    assert first.is_closed
+    assert http_pool.get_http_client() is not first
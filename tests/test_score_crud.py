@@ -1,14 +1,26 @@
+import json
 import pytest
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import delete, func, select
 from sqlalchemy.orm import Session
 from datetime import datetime
 
 from models.scores import ScoreSheet
-from schemas.scores import ScoreCreate
+from schemas.scores import Score, ScoreCreate
+from services.leaderboard import leaderboard
 from crud.score_crud import (
     get_all_scores,
     get_high_score,
+    get_top_scores,
     create_score,
     delete_score_by_username,
+    get_scores_by_username,
+    get_best_score_by_username,
+    get_best_scores_per_user,
+    get_score_rank,
+    get_user_rank,
+    get_all_scores_json,
+    get_top_scores_json,
 )
 
 
@@ -245,3 +257,144 @@ class TestDeleteScoreByUsername:
         assert deleted_count == 3  # All case variations should be deleted
         remaining = get_all_scores(test_db_session)
         assert len(remaining) == 0
+
+
+class TestLeaderboard:
+    """Test the in-memory leaderboard backing the score reads"""
+    
+    def test_get_top_scores_limits_and_orders(self, test_db_session: Session):
+        """Test that get_top_scores returns the k best scores, ties in insertion order"""
+        for score, user in [(100, "A"), (400, "B"), (400, "C"), (50, "D")]:
+            create_score(test_db_session, ScoreCreate(high_score=score, high_scorer=user))
+        
+        top = get_top_scores(test_db_session, 3)
+        
+        assert [(s.high_score, s.high_scorer) for s in top] == [(400, "B"), (400, "C"), (100, "A")]
+    
+    def test_leaderboard_seeded_from_existing_rows(self, test_db_session: Session):
+        """Test that rows inserted before loading are picked up by the seed"""
+        test_db_session.add(ScoreSheet(high_score=70, high_scorer="Seeded"))
+        test_db_session.commit()
+        
+        result = get_high_score(test_db_session)
+        
+        assert leaderboard.loaded
+        assert result.high_scorer == "Seeded"
+    
+    def test_leaderboard_tracks_inserts_and_deletes(self, test_db_session: Session):
+        """Test that the loaded board follows create_score and delete_score_by_username"""
+        create_score(test_db_session, ScoreCreate(high_score=100, high_scorer="Keep"))
+        assert get_high_score(test_db_session).high_score == 100
+        
+        create_score(test_db_session, ScoreCreate(high_score=900, high_scorer="Gone"))
+        assert get_high_score(test_db_session).high_scorer == "Gone"
+        
+        delete_score_by_username(test_db_session, "gone")
+        
+        assert get_high_score(test_db_session).high_scorer == "Keep"
+        assert len(leaderboard) == 1
+    
+    def test_writes_during_load_are_replayed(self, test_db_session: Session, monkeypatch):
+        """Test inserts and deletes made while the seed query runs end up on the board"""
+        kept = create_score(test_db_session, ScoreCreate(high_score=100, high_scorer="Kept"))
+        gone = create_score(test_db_session, ScoreCreate(high_score=300, high_scorer="Gone"))
+        fetch = leaderboard._fetch
+        
+        def fetch_with_concurrent_writes(db):
+            entries = fetch(db)
+            leaderboard.add(Score(id=999, high_score=500, high_scorer="Late", date_created=datetime.now()))
+            leaderboard.add(Score.model_validate(kept))
+            leaderboard.remove([gone.id])
+            return entries
+        
+        monkeypatch.setattr(leaderboard, "_fetch", fetch_with_concurrent_writes)
+        leaderboard.load(test_db_session)
+        
+        assert [s.high_scorer for s in leaderboard.top(10)] == ["Late", "Kept"]
+
+
+class TestScoresByUsername:
+    """Test the per-user score queries"""
+    
+    def test_scores_by_username_case_insensitive(self, test_db_session: Session):
+        """Test all scores of a user are returned best first regardless of case"""
+        create_score(test_db_session, ScoreCreate(high_score=50, high_scorer="Alice"))
+        create_score(test_db_session, ScoreCreate(high_score=90, high_scorer="alice"))
+        create_score(test_db_session, ScoreCreate(high_score=70, high_scorer="Bob"))
+        
+        scores = get_scores_by_username(test_db_session, "ALICE")
+        
+        assert [s.high_score for s in scores] == [90, 50]
+        assert get_best_score_by_username(test_db_session, "alice").high_score == 90
+        assert get_best_score_by_username(test_db_session, "carol") is None
+    
+    def test_best_scores_per_user(self, test_db_session: Session):
+        """Test one best entry per user, ordered by score"""
+        for score, user in [(50, "Alice"), (90, "alice"), (70, "Bob"), (20, "Bob"), (80, "Carol")]:
+            create_score(test_db_session, ScoreCreate(high_score=score, high_scorer=user))
+        
+        best = get_best_scores_per_user(test_db_session)
+        
+        assert [(s.high_score, s.high_scorer) for s in best] == [(90, "alice"), (80, "Carol"), (70, "Bob")]
+        assert len(get_best_scores_per_user(test_db_session, limit=2)) == 2
+    
+    def test_username_lookups_use_expression_index(self, test_db_session: Session):
+        """Test SQLite plans user lookups and deletes through ix_high_score_scorer_lower"""
+        lookup = select(ScoreSheet).where(func.lower(ScoreSheet.high_scorer) == func.lower("alice"))
+        removal = delete(ScoreSheet).where(func.lower(ScoreSheet.high_scorer) == func.lower("alice"))
+        
+        for stmt in (lookup, removal):
+            compiled = stmt.compile(compile_kwargs={"literal_binds": True})
+            plan = test_db_session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}").all()
+            assert any("ix_high_score_scorer_lower" in row[-1] for row in plan)
+
+
+class TestScoreRank:
+    """Test get_score_rank and get_user_rank functions"""
+    
+    def test_score_rank_and_percentile(self, test_db_session: Session):
+        """Test ranks count strictly higher scores, so ties share a rank"""
+        for i, score in enumerate([100, 90, 90, 50, 10]):
+            create_score(test_db_session, ScoreCreate(high_score=score, high_scorer=f"P{i}"))
+        
+        assert get_score_rank(test_db_session, 100).model_dump() == {"score": 100, "rank": 1, "total": 5, "percentile": 20.0}
+        assert get_score_rank(test_db_session, 90).rank == 2
+        assert get_score_rank(test_db_session, 50).rank == 4
+        assert get_score_rank(test_db_session, 95).rank == 2
+        assert get_score_rank(test_db_session, 5).percentile == 100.0
+    
+    def test_score_rank_on_empty_board(self, test_db_session: Session):
+        """Test an empty board ranks any score first"""
+        result = get_score_rank(test_db_session, 10)
+        
+        assert (result.rank, result.total, result.percentile) == (1, 0, 100.0)
+    
+    def test_user_rank_uses_best_score(self, test_db_session: Session):
+        """Test a user is ranked by their best entry"""
+        create_score(test_db_session, ScoreCreate(high_score=300, high_scorer="Top"))
+        create_score(test_db_session, ScoreCreate(high_score=20, high_scorer="Alice"))
+        create_score(test_db_session, ScoreCreate(high_score=200, high_scorer="alice"))
+        
+        result = get_user_rank(test_db_session, "ALICE")
+        
+        assert (result.score, result.rank, result.total) == (200, 2, 3)
+        assert get_user_rank(test_db_session, "nobody") is None
+
+
+class TestScoresJson:
+    """Test the pre-serialized score list functions"""
+    
+    def test_scores_json_matches_response_model(self, test_db_session: Session):
+        """Test the bytes equal what FastAPI renders for response_model=list[Score]"""
+        for score, user in [(10, "Zoë"), (90, "B"), (50, "C")]:
+            create_score(test_db_session, ScoreCreate(high_score=score, high_scorer=user))
+        
+        def render(scores):
+            return json.dumps(
+                jsonable_encoder([Score.model_validate(s) for s in scores]),
+                ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":"),
+            ).encode("utf-8")
+        
+        assert get_all_scores_json(test_db_session) == render(get_all_scores(test_db_session))
+        assert get_all_scores_json(test_db_session, 1, 1) == render(get_all_scores(test_db_session, 1, 1))
+        assert get_top_scores_json(test_db_session, 2) == render(get_top_scores(test_db_session, 2))
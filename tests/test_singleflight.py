@@ -0,0 +1,80 @@
+import asyncio
+import pytest
+
+from services.singleflight import SingleFlight
+
+
+async def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "result"
+
+    results = await asyncio.gather(*(flight.do("key", work) for _ in range(20)))
+
+    assert results == ["result"] * 20
+    assert calls == 1
+    assert flight.in_flight() == 0
+
+
+async def test_different_keys_run_separately():
+    flight = SingleFlight()
+    calls = []
+
+    async def work(key):
+        calls.append(key)
+        await asyncio.sleep(0)
+        return key
+
+    results = await asyncio.gather(flight.do("a", lambda: work("a")), flight.do("b", lambda: work("b")))
+
+    assert results == ["a", "b"]
+    assert sorted(calls) == ["a", "b"]
+
+
+async def test_errors_reach_every_waiter():
+    flight = SingleFlight()
+
+    async def boom():
+        await asyncio.sleep(0.01)
+        raise ValueError("provider down")
+
+    results = await asyncio.gather(*(flight.do("key", boom) for _ in range(5)), return_exceptions=True)
+
+    assert all(isinstance(r, ValueError) for r in results)
+    assert flight.in_flight() == 0
+
+
+async def test_cancelled_caller_does_not_cancel_others():
+    flight = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    leader = asyncio.ensure_future(flight.do("key", work))
+    await asyncio.sleep(0)
+    follower = asyncio.ensure_future(flight.do("key", work))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await follower == "done"
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+
+
+async def test_new_call_after_completion_runs_again():
+    flight = SingleFlight()
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        return calls
+
+    assert await flight.do("key", work) == 1
+    assert await flight.do("key", work) == 2
@@ -0,0 +1,92 @@
+import base64
+import asyncio
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+
+from routers import text_to_speech
+from schemas.llm_client import TextToSpeechReq, TextToSpeechLLMRes
+from services.tts_cache import audio_cache, tts_cache_key
+
+
+def clip(text: str) -> str:
+    return base64.b64encode(f"RIFF-{text}".encode()).decode()
+
+
+@pytest.fixture
+def tts_calls(monkeypatch):
+    calls = []
+
+    async def fake_tts(req):
+        calls.append(req)
+        return TextToSpeechLLMRes(req_id=f"req-{len(calls)}", audio=[clip(req.text)])
+
+    monkeypatch.setattr(text_to_speech, "sarvamTextToSpeech", fake_tts)
+    return calls
+
+
+class TestAudioCache:
+    """Test the content addressed TTS audio cache"""
+    
+    def test_repeat_pronunciation_served_from_disk(self, test_client: TestClient, tts_calls):
+        """Test that the same request is synthesized once"""
+        first = test_client.post("/ai/text_to_speech", json={"text": "ardent"})
+        second = test_client.post("/ai/text_to_speech", json={"text": "ardent"})
+        
+        assert first.status_code == second.status_code == 200
+        assert second.json()["llm_res"]["audio"] == first.json()["llm_res"]["audio"] == [clip("ardent")]
+        assert len(tts_calls) == 1
+        stats = test_client.get("/ai/text_to_speech/cache_stats").json()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+    
+    def test_key_covers_voice_settings(self, test_client: TestClient, tts_calls):
+        """Test that a different speaker or pace is a different entry"""
+        test_client.post("/ai/text_to_speech", json={"text": "ardent"})
+        test_client.post("/ai/text_to_speech", json={"text": "ardent", "pace": "1.2"})
+        test_client.post("/ai/text_to_speech", json={"text": "ardent", "speaker": "anushka"})
+        
+        assert len(tts_calls) == 3
+        assert tts_cache_key(TextToSpeechReq(text="a")) != tts_cache_key(TextToSpeechReq(text="a", model="other"))
+    
+    def test_lru_eviction_bounded_by_size(self):
+        """Test that the least recently used clips are dropped when over budget"""
+        audio_cache.max_bytes = 2 * len(base64.b64decode(clip("one")))
+        requests = {text: TextToSpeechReq(text=text) for text in ["one", "two", "six"]}
+        
+        audio_cache.put(requests["one"], TextToSpeechLLMRes(audio=[clip("one")]))
+        audio_cache.put(requests["two"], TextToSpeechLLMRes(audio=[clip("two")]))
+        assert audio_cache.get(requests["one"]) is not None
+        audio_cache.put(requests["six"], TextToSpeechLLMRes(audio=[clip("six")]))
+        
+        assert audio_cache.get(requests["two"]) is None
+        assert audio_cache.get(requests["one"]).audio == [clip("one")]
+        assert audio_cache.stats()["entries"] == 2
+    
+    def test_index_rebuilt_from_disk(self):
+        """Test that stored clips are found again after a restart"""
+        req = TextToSpeechReq(text="ardent")
+        audio_cache.put(req, TextToSpeechLLMRes(audio=[clip("a"), clip("b")]))
+        
+        audio_cache.configure(directory=audio_cache.directory)
+        
+        assert audio_cache.get(req).audio == [clip("a"), clip("b")]
+    
+    async def test_concurrent_requests_coalesced(self, monkeypatch):
+        """Test that identical TTS requests in flight share one synthesis"""
+        calls = []
+        
+        async def slow_tts(req):
+            calls.append(req)
+            await asyncio.sleep(0.05)
+            return TextToSpeechLLMRes(req_id="r1", audio=[clip(req.text)])
+        
+        monkeypatch.setattr(text_to_speech, "sarvamTextToSpeech", slow_tts)
+        
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            responses = await asyncio.gather(*(client.post("/ai/text_to_speech", json={"text": "ardent"}) for _ in range(8)))
+        
+        assert all(r.json()["llm_res"]["audio"] == [clip("ardent")] for r in responses)
+        assert len(calls) == 1
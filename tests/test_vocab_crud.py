@@ -1,15 +1,36 @@
+import gzip
+import json
 import pytest
+from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import Session
 from datetime import datetime
 
 from models.vocab import EnglishVocab
-from schemas.vocab import VocabCreate, VocabUpdate
+from schemas.vocab import VocabCreate, VocabUpdate, VocabBulkUpdate
 from crud.vocab_crud import (
     get_all_vocab,
     get_vocab_by_word,
     create_vocab,
     update_vocab,
+    bulk_create_vocab,
+    sample_vocab_by_type,
+    search_vocab,
+    build_match_query,
+    autocomplete_vocab,
+    fill_missing_fields,
+    get_vocab_snapshot,
+    get_vocab_by_type,
+    get_vocab_json,
+    get_all_word_types,
+    get_vocab_by_count,
+    get_word_type_catalog,
+    bulk_update_vocab,
+    upsert_vocab,
 )
+from schemas.vocab import Vocab
+from services.vocab_version import vocab_version
+from services.vocab_snapshot import vocab_snapshot
+from services import word_prefix_index as word_prefix_index_module
 
 
 class TestGetAllVocab:
@@ -198,3 +219,336 @@ class TestUpdateVocab:
         # updated_at should be updated
         assert result.updated_at >= original_updated_at
         assert result.created_at == db_vocab.created_at  # created_at should not change
+
+
+class TestBulkCreateVocab:
+    """Test bulk_create_vocab function"""
+    
+    def test_bulk_create_vocab_inserts_all(self, test_db_session: Session):
+        """Test bulk inserting new vocabs in one call"""
+        vocabs = [VocabCreate(word=f"word{i}", word_type="noun") for i in range(1200)]
+        
+        report = bulk_create_vocab(test_db_session, vocabs)
+        
+        assert report["words_inserted"] == 1200
+        assert report["existing_words"] == set()
+        assert len(get_all_vocab(test_db_session)) == 1200
+        assert get_vocab_by_word(test_db_session, "word999").created_at is not None
+    
+    def test_bulk_create_vocab_skips_existing_and_payload_duplicates(self, test_db_session: Session):
+        """Test that stored words and repeated payload words are reported, not inserted"""
+        create_vocab(test_db_session, VocabCreate(word="stored"))
+        vocabs = [
+            VocabCreate(word="stored"),
+            VocabCreate(word="fresh", meaning="first"),
+            VocabCreate(word="fresh", meaning="second"),
+        ]
+        
+        report = bulk_create_vocab(test_db_session, vocabs, chunk_size=1)
+        
+        assert report["words_inserted"] == 1
+        assert report["existing_words"] == {"stored", "fresh"}
+        assert get_vocab_by_word(test_db_session, "fresh").meaning == "first"
+
+
+class TestSampleVocabByType:
+    """Test sample_vocab_by_type function"""
+    
+    def test_sample_returns_distinct_words_of_type(self, test_db_session: Session):
+        """Test sampling picks k distinct vocabs of the requested type only"""
+        bulk_create_vocab(test_db_session, [VocabCreate(word=f"verb{i}", word_type="verb") for i in range(20)])
+        create_vocab(test_db_session, VocabCreate(word="cat", word_type="noun"))
+        
+        sample = sample_vocab_by_type(test_db_session, "verb", 5)
+        
+        assert len(sample) == 5
+        assert len({v.word for v in sample}) == 5
+        assert all(v.word_type == "verb" for v in sample)
+    
+    def test_sample_caps_at_available_and_unknown_type(self, test_db_session: Session):
+        """Test k larger than the type returns every vocab, unknown types return none"""
+        create_vocab(test_db_session, VocabCreate(word="cat", word_type="noun"))
+        
+        assert [v.word for v in sample_vocab_by_type(test_db_session, "noun", 10)] == ["cat"]
+        assert sample_vocab_by_type(test_db_session, "adverb", 10) == []
+    
+    def test_sample_follows_writes_after_index_load(self, test_db_session: Session):
+        """Test the index tracks creates and word_type updates once loaded"""
+        vocab = create_vocab(test_db_session, VocabCreate(word="run", word_type="noun"))
+        assert len(sample_vocab_by_type(test_db_session, "noun", 5)) == 1
+        
+        update_vocab(test_db_session, vocab, VocabUpdate(word_type="verb"))
+        create_vocab(test_db_session, VocabCreate(word="jump", word_type="verb"))
+        
+        assert sample_vocab_by_type(test_db_session, "noun", 5) == []
+        assert {v.word for v in sample_vocab_by_type(test_db_session, "verb", 5)} == {"run", "jump"}
+
+
+class TestSearchVocab:
+    """Test search_vocab function"""
+    
+    def test_search_ranks_word_matches_first(self, test_db_session: Session):
+        """Test matches in the word column outrank matches in meaning and example"""
+        create_vocab(test_db_session, VocabCreate(word="ardent", meaning="full of passion"))
+        create_vocab(test_db_session, VocabCreate(word="zeal", meaning="great energy", example="An ardent zeal"))
+        create_vocab(test_db_session, VocabCreate(word="calm", meaning="peaceful"))
+        
+        page = search_vocab(test_db_session, "ardent")
+        
+        assert page["total"] == 2
+        assert [r.word for r in page["results"]] == ["ardent", "zeal"]
+        assert "<mark>" in page["results"][1].snippet
+    
+    def test_search_prefix_and_pagination(self, test_db_session: Session):
+        """Test trailing * matches prefixes and limit/offset page through hits"""
+        for word in ["passion", "passive", "passage", "other"]:
+            create_vocab(test_db_session, VocabCreate(word=word))
+        
+        assert search_vocab(test_db_session, "pass")["total"] == 0
+        first = search_vocab(test_db_session, "pass*", limit=2)
+        second = search_vocab(test_db_session, "pass*", limit=2, offset=2)
+        
+        assert first["total"] == 3
+        assert len(first["results"]) == 2
+        assert len(second["results"]) == 1
+        assert {r.word for r in first["results"] + second["results"]} == {"passion", "passive", "passage"}
+    
+    def test_search_follows_updates_and_bulk_inserts(self, test_db_session: Session):
+        """Test the FTS index is kept in sync by the table triggers"""
+        vocab = create_vocab(test_db_session, VocabCreate(word="ardent", meaning="passionate"))
+        bulk_create_vocab(test_db_session, [VocabCreate(word="fervent", meaning="passionate")])
+        update_vocab(test_db_session, vocab, VocabUpdate(meaning="eager"))
+        
+        assert [r.word for r in search_vocab(test_db_session, "passionate")["results"]] == ["fervent"]
+        assert [r.word for r in search_vocab(test_db_session, "eager")["results"]] == ["ardent"]
+    
+    def test_build_match_query_quotes_terms(self):
+        """Test FTS5 syntax in user input is neutralised"""
+        assert build_match_query('ardent "OR" (zeal* -x') == '"ardent" "OR" "zeal"* "x"'
+        assert build_match_query("***") is None
+
+
+class TestAutocompleteVocab:
+    """Test autocomplete_vocab function"""
+    
+    def test_autocomplete_matches_prefix_in_order(self, test_db_session: Session):
+        """Test words are matched case-insensitively and returned in sorted order"""
+        for word in ["Arden", "ardent", "argue", "bard"]:
+            create_vocab(test_db_session, VocabCreate(word=word))
+        
+        assert autocomplete_vocab(test_db_session, "ARD") == ["Arden", "ardent"]
+        assert autocomplete_vocab(test_db_session, "ar", limit=2) == ["Arden", "ardent"]
+        assert autocomplete_vocab(test_db_session, "z") == []
+    
+    def test_autocomplete_includes_words_added_after_load(self, test_db_session: Session):
+        """Test create and bulk create extend an already loaded index"""
+        create_vocab(test_db_session, VocabCreate(word="ardent"))
+        assert autocomplete_vocab(test_db_session, "ar") == ["ardent"]
+        
+        create_vocab(test_db_session, VocabCreate(word="argue"))
+        bulk_create_vocab(test_db_session, [VocabCreate(word=f"arc{i:02d}") for i in range(40)])
+        
+        words = autocomplete_vocab(test_db_session, "ar", limit=50)
+        assert len(words) == 42
+        assert words[:2] == ["arc00", "arc01"]
+        assert words[-2:] == ["ardent", "argue"]
+    
+    def test_autocomplete_merges_buffered_words(self, test_db_session: Session, monkeypatch):
+        """Test words in the insert buffer and the main list come back in one sorted list"""
+        monkeypatch.setattr(word_prefix_index_module, "RECENT_BUFFER_SIZE", 40)
+        create_vocab(test_db_session, VocabCreate(word="arb"))
+        assert autocomplete_vocab(test_db_session, "ar") == ["arb"]
+        
+        bulk_create_vocab(test_db_session, [VocabCreate(word=f"ar{i:02d}") for i in range(0, 80, 2)])
+        bulk_create_vocab(test_db_session, [VocabCreate(word=f"ar{i:02d}") for i in range(1, 80, 2)][:39])
+        
+        assert autocomplete_vocab(test_db_session, "ar", limit=4) == ["ar00", "ar01", "ar02", "ar03"]
+        assert autocomplete_vocab(test_db_session, "ar7", limit=20) == [f"ar{i}" for i in range(70, 79)]
+        assert autocomplete_vocab(test_db_session, "arb") == ["arb"]
+
+
+class TestVocabVersion:
+    """Test that vocab writes bump the dataset version"""
+    
+    def test_every_write_path_bumps_version(self, test_db_session: Session):
+        """Test create, bulk create, update and fill each change the ETag"""
+        seen = {vocab_version.etag()}
+        
+        vocab = create_vocab(test_db_session, VocabCreate(word="ardent"))
+        seen.add(vocab_version.etag())
+        bulk_create_vocab(test_db_session, [VocabCreate(word="zeal")])
+        seen.add(vocab_version.etag())
+        update_vocab(test_db_session, vocab, VocabUpdate(meaning="eager"))
+        seen.add(vocab_version.etag())
+        fill_missing_fields(test_db_session, [{"id": vocab.id, "example": "An ardent fan"}])
+        seen.add(vocab_version.etag())
+        
+        assert len(seen) == 5
+
+
+def render_response_model(items, model):
+    """Bytes FastAPI renders for response_model=list[model]"""
+    return json.dumps(
+        jsonable_encoder([model.model_validate(i) for i in items]),
+        ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":"),
+    ).encode("utf-8")
+
+
+class TestGetVocabJson:
+    """Test get_vocab_json function"""
+    
+    def test_vocab_json_matches_orm_path(self, test_db_session: Session):
+        """Test the Core fast path renders the same bytes as the ORM path"""
+        create_vocab(test_db_session, VocabCreate(word="café", word_type="noun", meaning="a coffee shop", example='The "best" café'))
+        create_vocab(test_db_session, VocabCreate(word="run", word_type="verb"))
+        create_vocab(test_db_session, VocabCreate(word="dog", word_type="noun"))
+        
+        assert get_vocab_json(test_db_session) == render_response_model(get_all_vocab(test_db_session), Vocab)
+        assert get_vocab_json(test_db_session, "noun") == render_response_model(get_vocab_by_type(test_db_session, "noun"), Vocab)
+        assert get_vocab_json(test_db_session, "noun", 1) == render_response_model(get_vocab_by_type(test_db_session, "noun", 1), Vocab)
+        assert get_vocab_json(test_db_session, "adverb") == b"[]"
+
+
+class TestVocabSnapshot:
+    """Test get_vocab_snapshot function"""
+    
+    def test_snapshot_matches_response_model_encoding(self, test_db_session: Session):
+        """Test snapshot bytes equal what FastAPI renders for response_model=list[Vocab]"""
+        create_vocab(test_db_session, VocabCreate(word="naïve", word_type="adjective", meaning="innocent"))
+        create_vocab(test_db_session, VocabCreate(word="run", word_type="verb"))
+        rendered = render_response_model(get_all_vocab(test_db_session), Vocab)
+        
+        assert get_vocab_snapshot(test_db_session) == rendered
+        assert [v["word"] for v in json.loads(get_vocab_snapshot(test_db_session, "verb"))] == ["run"]
+    
+    def test_snapshot_built_once_per_version(self, test_db_session: Session):
+        """Test repeated reads reuse the bytes until a write bumps the version"""
+        create_vocab(test_db_session, VocabCreate(word="run"))
+        
+        first = get_vocab_snapshot(test_db_session)
+        assert get_vocab_snapshot(test_db_session) is first
+        assert gzip.decompress(get_vocab_snapshot(test_db_session, compressed=True)) == first
+        assert vocab_snapshot.builds == 1
+        
+        create_vocab(test_db_session, VocabCreate(word="jump"))
+        
+        assert len(json.loads(get_vocab_snapshot(test_db_session))) == 2
+        assert vocab_snapshot.builds == 2
+    
+    def test_snapshot_skips_unknown_types(self, test_db_session: Session):
+        """Test types without words are answered empty and never cached"""
+        create_vocab(test_db_session, VocabCreate(word="run", word_type="verb"))
+        
+        assert get_vocab_snapshot(test_db_session, "x1") == b"[]"
+        assert gzip.decompress(get_vocab_snapshot(test_db_session, "x2", compressed=True)) == b"[]"
+        assert vocab_snapshot.builds == 0
+
+
+class TestWordTypeCatalog:
+    """Test the word_type catalog functions"""
+    
+    def test_catalog_counts_and_excludes_untyped(self, test_db_session: Session):
+        """Test types are listed in order with their counts, untyped vocabs are left out"""
+        bulk_create_vocab(test_db_session, [
+            VocabCreate(word="run", word_type="verb"),
+            VocabCreate(word="jump", word_type="verb"),
+            VocabCreate(word="cat", word_type="noun"),
+            VocabCreate(word="untyped"),
+        ])
+        
+        catalog = get_word_type_catalog(test_db_session)
+        
+        assert [(c.word_type, c.count) for c in catalog.word_types] == [("noun", 1), ("verb", 2)]
+        assert get_all_word_types(test_db_session).word_types == ["noun", "verb"]
+        assert get_vocab_by_count(test_db_session, "verb").count == 2
+        assert get_vocab_by_count(test_db_session, "adverb").count == 0
+    
+    def test_catalog_follows_creates_and_type_changes(self, test_db_session: Session):
+        """Test counts move with create_vocab and update_vocab once the catalog is loaded"""
+        vocab = create_vocab(test_db_session, VocabCreate(word="run", word_type="noun"))
+        assert get_vocab_by_count(test_db_session, "noun").count == 1
+        
+        update_vocab(test_db_session, vocab, VocabUpdate(word_type="verb"))
+        create_vocab(test_db_session, VocabCreate(word="jump", word_type="verb"))
+        
+        assert [(c.word_type, c.count) for c in get_word_type_catalog(test_db_session).word_types] == [("verb", 2)]
+    
+    def test_catalog_follows_bulk_type_changes(self, test_db_session: Session):
+        """Test a batch of type changes moves every id exactly once"""
+        bulk_create_vocab(test_db_session, [VocabCreate(word=f"word{i}", word_type="noun") for i in range(10)])
+        assert get_vocab_by_count(test_db_session, "noun").count == 10
+        
+        bulk_update_vocab(test_db_session, [VocabBulkUpdate(word=f"word{i}", word_type="verb") for i in range(0, 10, 2)])
+        
+        assert [(c.word_type, c.count) for c in get_word_type_catalog(test_db_session).word_types] == [("noun", 5), ("verb", 5)]
+        assert sorted(v.word for v in sample_vocab_by_type(test_db_session, "verb", 10)) == [f"word{i}" for i in range(0, 10, 2)]
+
+
+class TestBulkUpdateVocab:
+    """Test bulk_update_vocab function"""
+    
+    def test_bulk_update_applies_set_fields_only(self, test_db_session: Session):
+        """Test each item writes only the fields it sets and reports an outcome"""
+        create_vocab(test_db_session, VocabCreate(word="run", word_type="verb", meaning="old", example="keep me"))
+        create_vocab(test_db_session, VocabCreate(word="cat", word_type="noun", meaning="animal"))
+        before = get_vocab_by_word(test_db_session, "run").updated_at
+        
+        report = bulk_update_vocab(test_db_session, [
+            VocabBulkUpdate(word="run", meaning="move fast"),
+            VocabBulkUpdate(word="cat", example="The cat sat"),
+            VocabBulkUpdate(word="ghost", meaning="missing"),
+            VocabBulkUpdate(word="run", meaning="ignored"),
+        ], chunk_size=1)
+        
+        assert report["words_updated"] == 2
+        assert [r["status"] for r in report["results"]] == ["updated", "updated", "not_found", "duplicate"]
+        run = get_vocab_by_word(test_db_session, "run")
+        assert (run.meaning, run.example, run.word_type) == ("move fast", "keep me", "verb")
+        assert run.updated_at > before
+        assert get_vocab_by_word(test_db_session, "cat").meaning == "animal"
+        assert get_vocab_by_word(test_db_session, "cat").example == "The cat sat"
+    
+    def test_bulk_update_keeps_indexes_in_sync(self, test_db_session: Session):
+        """Test type changes move counts and new meanings become searchable"""
+        create_vocab(test_db_session, VocabCreate(word="run", word_type="noun"))
+        assert get_vocab_by_count(test_db_session, "noun").count == 1
+        
+        bulk_update_vocab(test_db_session, [VocabBulkUpdate(word="run", word_type="verb", meaning="sprint")])
+        
+        assert get_vocab_by_count(test_db_session, "noun").count == 0
+        assert get_vocab_by_count(test_db_session, "verb").count == 1
+        assert [r.word for r in search_vocab(test_db_session, "sprint")["results"]] == ["run"]
+    
+    def test_bulk_update_without_fields_is_unchanged(self, test_db_session: Session):
+        """Test an item with only a word is reported unchanged and not written"""
+        create_vocab(test_db_session, VocabCreate(word="run", meaning="move fast"))
+        before = get_vocab_by_word(test_db_session, "run").updated_at
+        
+        report = bulk_update_vocab(test_db_session, [VocabBulkUpdate(word="run")])
+        
+        assert report["words_updated"] == 0
+        assert report["results"] == [{"word": "run", "status": "unchanged"}]
+        assert get_vocab_by_word(test_db_session, "run").updated_at == before
+
+
+class TestUpsertVocab:
+    """Test upsert_vocab function"""
+    
+    def test_upsert_inserts_and_updates(self, test_db_session: Session):
+        """Test new words are inserted and stored ones updated in one call"""
+        create_vocab(test_db_session, VocabCreate(word="run", word_type="verb", meaning="old"))
+        create_vocab(test_db_session, VocabCreate(word="cat", word_type="noun", meaning="animal"))
+        
+        report = upsert_vocab(test_db_session, [
+            VocabCreate(word="run", meaning="move fast"),
+            VocabCreate(word="jump", word_type="verb"),
+            VocabCreate(word="cat"),
+            VocabCreate(word="jump", word_type="noun"),
+        ])
+        
+        assert (report["words_inserted"], report["words_updated"]) == (1, 1)
+        assert [r["status"] for r in report["results"]] == ["updated", "inserted", "unchanged", "duplicate"]
+        assert get_vocab_by_word(test_db_session, "run").meaning == "move fast"
+        assert get_vocab_by_word(test_db_session, "run").word_type == "verb"
+        assert get_vocab_by_word(test_db_session, "jump").word_type == "verb"
+        assert get_vocab_by_word(test_db_session, "cat").meaning == "animal"
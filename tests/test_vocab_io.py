@@ -0,0 +1,71 @@
+import io
+import csv
+
+from schemas.vocab import VocabCreate
+from services.vocab_io import VocabReader, detect_format, take, vocab_csv_chunk, VOCAB_CSV_COLUMNS
+
+
+class TestVocabReader:
+    """Test parsing of CSV and JSONL uploads"""
+    
+    def test_csv_rows_and_quoted_newlines(self):
+        """Test CSV rows map onto VocabCreate, empty cells become None"""
+        data = 'word,word_type,meaning,example,extra\nrun,verb,"move\nfast",,x\n,noun,,,\n'.encode("utf-8")
+        
+        rows = list(VocabReader(io.BytesIO(data), "csv"))
+        
+        assert rows[0] == (3, VocabCreate(word="run", word_type="verb", meaning="move\nfast"), None)
+        assert rows[1][1] is None
+        assert rows[1][2].startswith("word:")
+    
+    def test_csv_requires_word_column(self):
+        """Test a header without word is reported"""
+        assert VocabReader(io.BytesIO(b"meaning\nx\n"), "csv").missing_columns() == ["word"]
+        assert VocabReader(io.BytesIO(b"\xef\xbb\xbfword\nx\n"), "csv").missing_columns() == []
+    
+    def test_jsonl_skips_blank_lines_and_reports_bad_lines(self):
+        """Test JSONL lines are parsed one by one with line numbers"""
+        data = b'{"word": "run"}\n\nnot json\n{"meaning": "no word"}\n'
+        
+        rows = list(VocabReader(io.BytesIO(data), "jsonl"))
+        
+        assert [(line, vocab.word if vocab else None) for line, vocab, _ in rows] == [(1, "run"), (3, None), (4, None)]
+        assert rows[1][2].startswith("invalid JSON")
+    
+    def test_invalid_utf8_lines_are_row_errors(self):
+        """Test a line that is not UTF-8 fails only its own row"""
+        csv_data = b'word,meaning\nrun,"move\n\xff fast"\ncat,animal\n'
+        jsonl_data = b'{"word": "caf\xe9"}\n{"word": "run"}\n'
+        
+        csv_rows = list(VocabReader(io.BytesIO(csv_data), "csv"))
+        jsonl_rows = list(VocabReader(io.BytesIO(jsonl_data), "jsonl"))
+        
+        assert csv_rows == [(3, None, "invalid UTF-8"), (4, VocabCreate(word="cat", meaning="animal"), None)]
+        assert jsonl_rows == [(1, None, "invalid UTF-8"), (2, VocabCreate(word="run"), None)]
+    
+    def test_take_and_detect_format(self):
+        """Test chunking helper and format detection"""
+        rows = iter(range(5))
+        
+        assert take(rows, 3) == [0, 1, 2]
+        assert take(rows, 3) == [3, 4]
+        assert take(rows, 3) == []
+        assert detect_format("words.CSV") == "csv"
+        assert detect_format("words.ndjson") == "jsonl"
+        assert detect_format("words.txt") is None
+        assert detect_format("words.txt", "jsonl") == "jsonl"
+
+
+class TestVocabCsvChunk:
+    """Test CSV rendering of vocabs for export"""
+    
+    def test_csv_chunk_header_and_rows(self):
+        """Test the header is written once and values are quoted as needed"""
+        vocab = {"id": 1, "word": "run", "word_type": "verb", "meaning": "move, fast", "example": None,
+                 "created_at": "2024-01-01T00:00:00", "updated_at": "2024-01-01T00:00:00"}
+        
+        rows = list(csv.reader(io.StringIO(vocab_csv_chunk([vocab], header=True))))
+        
+        assert rows[0] == list(VOCAB_CSV_COLUMNS)
+        assert dict(zip(rows[0], rows[1]))["meaning"] == "move, fast"
+        assert vocab_csv_chunk([vocab]).count("\n") == 1